@@ -0,0 +1,51 @@
+"""
+Signatures/sec for ``AwsSigV4Auth`` on typical OpenSearch/S3 style requests.
+
+    python benchmarks/bench_awsutils.py [seconds]
+"""
+import sys
+import time
+
+import httpx
+
+from cbtoolz.awsutils import AwsSigV4Auth
+
+AUTH = AwsSigV4Auth("es", access_key="AKIDEXAMPLE", secret_key="secret", region="us-east-1")
+
+REQUESTS = {
+    "GET no query": lambda: httpx.Request("GET", "https://search.example.com/_cluster/health"),
+    "GET with query": lambda: httpx.Request(
+        "GET", "https://search.example.com/logs-*/_search?size=100&from=0&q=status%3A500&sort=ts%3Adesc"
+    ),
+    "POST 1 KiB body": lambda: httpx.Request(
+        "POST",
+        "https://search.example.com/logs/_doc",
+        content=b"x" * 1024,
+        headers={"Content-Type": "application/json"},
+    ),
+}
+
+
+def run(name: str, make_request, seconds: float) -> None:
+    # sign fresh requests each round, so earlier signatures don't end up among the signed headers
+    signed = 0
+    elapsed = 0.0
+    while elapsed < seconds:
+        requests = [make_request() for _ in range(1000)]
+        start = time.perf_counter()
+        for request in requests:
+            for _ in AUTH.auth_flow(request):
+                pass
+        elapsed += time.perf_counter() - start
+        signed += len(requests)
+    print(f"{name:<16} {signed / elapsed:10.0f} signatures/s")
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    for name, make_request in REQUESTS.items():
+        run(name, make_request, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Hit-path microbenchmarks for ``cbtoolz.cacheutils``.
+
+    python benchmarks/bench_cacheutils.py
+"""
+import timeit
+
+from cbtoolz.cacheutils import Cached, cached
+
+NUMBER = 200_000
+
+
+def report(name: str, fn) -> None:
+    best = min(timeit.repeat(fn, number=NUMBER, repeat=5))
+    print(f"{name:<24} {best / NUMBER * 1e9:8.1f} ns/call")
+
+
+def main() -> None:
+    standalone = Cached(lambda: ("value", 3600))
+    standalone()
+    report("Cached hit", standalone)
+
+    @cached
+    def getter(x):
+        return x, 3600
+
+    handle = getter(1)
+    handle()
+    report("@cached store hit", handle)
+    report("@cached lookup + hit", lambda: getter(1)())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Throughput benchmarks for ``cbtoolz.hashutils``.
+
+    python benchmarks/bench_hashutils.py
+"""
+import timeit
+
+from cbtoolz.hashutils import stable_hash
+
+NUMBER = 100_000
+SMALL_ARGS = ("cbtoolz.config", "get_setting", "us-east-1", 42, b"\x00\x01", 1_000_000)
+
+
+def main() -> None:
+    best = min(timeit.repeat(lambda: stable_hash(*SMALL_ARGS), number=NUMBER, repeat=5))
+    print(
+        f"stable_hash x{len(SMALL_ARGS)} small args  {NUMBER / best:12,.0f} calls/s  {best / NUMBER * 1e9:8.1f} ns/call"
+    )
+
+
+if __name__ == "__main__":
+    main()
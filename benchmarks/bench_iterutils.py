@@ -0,0 +1,68 @@
+"""
+Elements/sec through typical ``Iter`` method chains.
+
+    python benchmarks/bench_iterutils.py [n]
+"""
+import sys
+import time
+from typing import Callable
+
+from cbtoolz.iterutils import Iter
+
+
+def inc(x: int) -> int:
+    return x + 1
+
+
+def is_even(x: int) -> bool:
+    return not x & 1
+
+
+def second(pair):
+    return pair[1]
+
+
+CHAINS = {
+    "map": lambda it: it.map(inc),
+    "map.filter": lambda it: it.map(inc).filter(is_even),
+    "map x3": lambda it: it.map(inc).map(inc).map(inc),
+    "enumerate.map.filter": lambda it: it.enumerate().map(second).filter(is_even),
+    "6 stages": lambda it: it.map(inc).filter(is_even).map(inc).enumerate().map(second).takewhile(bool),
+}
+
+
+def run(name: str, chain: Callable[[Iter[int]], Iter[int]], n: int) -> None:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in chain(Iter(range(1, n + 1))):
+            pass
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<22} {n / best / 1e6:8.2f} M elements/s")
+
+
+def columnar_chain(it: Iter[int]):
+    return it.columnar(dtype=int).map(lambda a: a + 1).filter(lambda a: a & 1 == 0).accumulate()
+
+
+def run_columnar(n: int) -> None:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy not installed, skipping columnar chains")
+        return
+
+    run("map.filter.accumulate", lambda it: it.map(inc).filter(is_even).accumulate(), n)
+    run("  columnar -> scalars", lambda it: columnar_chain(it).scalars(), n)
+    run("  columnar -> arrays", lambda it: columnar_chain(it).arrays(), n)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for name, chain in CHAINS.items():
+        run(name, chain, n)
+    run_columnar(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Throughput of ``Iter.as_buffered_reader`` over a generator of byte chunks.
+
+    python benchmarks/bench_streams.py [total_mb]
+"""
+import sys
+import time
+
+from cbtoolz.iterutils import Iter
+
+MB = 1 << 20
+
+
+def chunks(total: int, size: int):
+    chunk = b"x" * size
+    for _ in range(total // size):
+        yield chunk
+
+
+def run(total: int, chunk_size: int, read_size: int) -> None:
+    reader = Iter(chunks(total, chunk_size)).as_buffered_reader()
+    start = time.perf_counter()
+    received = 0
+    while True:
+        data = reader.read(read_size)
+        if not data:
+            break
+        received += len(data)
+    elapsed = time.perf_counter() - start
+    assert received == total
+    print(f"chunk={chunk_size:>9} read={read_size:>6}  {total / MB / elapsed:10.1f} MB/s")
+
+
+def main() -> None:
+    total = int(sys.argv[1]) * MB if len(sys.argv) > 1 else 1024 * MB
+    for chunk_size, read_size in ((64 * 1024, 4096), (MB, 4096), (16 * MB, 65536)):
+        run(total, chunk_size, read_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,13 @@ from cbtoolz.importutils import lazy_import
 __getattr__ = lazy_import(
     __name__,
     submodules={
+        "aggregates",
         "asyncutils",
         "awsutils",
         "cacheutils",
         "callables",
         "collections",
+        "columnar",
         "config",
         "context",
         "dateutils",
@@ -40,11 +42,13 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from cbtoolz import (
+        aggregates,
         asyncutils,
         awsutils,
         cacheutils,
         callables,
         collections,
+        columnar,
         config,
         context,
         dateutils,
@@ -68,11 +72,13 @@ if TYPE_CHECKING:
     )
 
 __all__ = [
+    "aggregates",
     "asyncutils",
     "awsutils",
     "cacheutils",
     "callables",
     "collections",
+    "columnar",
     "config",
     "context",
     "dateutils",
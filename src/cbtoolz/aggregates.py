@@ -0,0 +1,282 @@
+"""
+Single-pass streaming aggregators. Each one consumes elements through ``add`` in constant (or
+``k``-bounded) memory and reports through ``result``; :func:`aggregate` feeds several of them from
+one traversal::
+
+    aggregate(events, n=Count(), p99=Quantiles(key=latency).at(0.99), users=Distinct(key=user_id))
+"""
+import heapq
+import itertools
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple
+
+from cbtoolz.types import R, T
+
+_MASK64 = (1 << 64) - 1
+
+
+class Aggregator(ABC, Generic[T, R]):
+    """Base class for aggregators: ``key`` (if given) extracts the value to aggregate from each element"""
+
+    def __init__(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        self.key = key
+
+    @abstractmethod
+    def add(self, value: T) -> None:
+        ...
+
+    @abstractmethod
+    def result(self) -> R:
+        ...
+
+    def update(self, values: Iterable[T]) -> "Aggregator[T, R]":
+        add = self.add
+        for value in values:
+            add(value)
+        return self
+
+    def _value(self, value: T) -> Any:
+        return value if self.key is None else self.key(value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.result()!r})"
+
+
+class Count(Aggregator[Any, int]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class Sum(Aggregator[T, Any]):
+    def __init__(self, key: Optional[Callable[[T], Any]] = None, start: Any = 0) -> None:
+        super().__init__(key)
+        self.total = start
+
+    def add(self, value: T) -> None:
+        self.total += self._value(value)
+
+    def result(self) -> Any:
+        return self.total
+
+
+class Mean(Aggregator[T, Optional[float]]):
+    def __init__(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        super().__init__(key)
+        self.count = 0
+        self.mean = 0.0
+
+    def add(self, value: T) -> None:
+        # running mean rather than sum / count, so it can't overflow a float on long streams
+        self.count += 1
+        self.mean += (self._value(value) - self.mean) / self.count
+
+    def result(self) -> Optional[float]:
+        return self.mean if self.count else None
+
+
+class Min(Aggregator[T, Optional[T]]):
+    """The smallest element, compared by ``key`` like :func:`min`; ``None`` for an empty stream"""
+
+    _better = staticmethod(lambda candidate, current: candidate < current)
+
+    def __init__(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        super().__init__(key)
+        self.item: Optional[T] = None
+        self._best: Any = None
+        self._empty = True
+
+    def add(self, value: T) -> None:
+        compared = self._value(value)
+        if self._empty or self._better(compared, self._best):
+            self.item, self._best, self._empty = value, compared, False
+
+    def result(self) -> Optional[T]:
+        return self.item
+
+
+class Max(Min[T]):
+    _better = staticmethod(lambda candidate, current: candidate > current)
+
+
+class TopK(Aggregator[T, List[T]]):
+    """The ``k`` largest elements by ``key`` (smallest with ``reverse=True``), best first, via a size-``k`` heap"""
+
+    def __init__(self, k: int, key: Optional[Callable[[T], Any]] = None, *, reverse: bool = False) -> None:
+        if k < 1:
+            raise ValueError("k must be positive")
+        super().__init__(key)
+        self.k = k
+        self.reverse = reverse
+        self._heap: List[Tuple[Any, int, T]] = []
+        self._counter = itertools.count()
+
+    def add(self, value: T) -> None:
+        compared = self._value(value)
+        if self.reverse:
+            compared = _Reversed(compared)
+        # the counter breaks ties so that elements themselves are never compared
+        entry = (compared, -next(self._counter), value)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+
+    def result(self) -> List[T]:
+        return [value for _, _, value in sorted(self._heap, reverse=True)]
+
+
+class _Reversed:
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Reversed) and self.value == other.value
+
+
+class Distinct(Aggregator[T, int]):
+    """
+    Approximate number of distinct elements (HyperLogLog). Uses ``2 ** precision`` one-byte registers
+    for a standard error of about ``1.04 / sqrt(2 ** precision)`` (0.8% at the default). Elements are
+    hashed with :func:`hash`, so they must be hashable and estimates are only comparable within a process.
+    """
+
+    def __init__(self, key: Optional[Callable[[T], Any]] = None, *, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        super().__init__(key)
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: T) -> None:
+        h = _mix64(hash(self._value(value)))
+        p = self.precision
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = 64 - p - rest.bit_length() + 1
+        index = h >> (64 - p)
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def result(self) -> int:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(math.ldexp(1.0, -r) for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # linear counting is more accurate while many registers are still empty
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+def _mix64(x: int) -> int:
+    # splitmix64 finalizer: spreads hash() values (which are the identity for small ints) over 64 bits
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class Quantiles(Aggregator[T, Any]):
+    """
+    Approximate quantiles (a KLL sketch). Memory stays around ``3 * k`` values regardless of the stream
+    length, with a rank error of roughly ``1.7 / k``. ``result`` reports the ``qs`` given to the
+    constructor; :meth:`quantile` answers any other.
+    """
+
+    def __init__(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        *,
+        qs: Sequence[float] = (0.5, 0.9, 0.99),
+        k: int = 200,
+        seed: Optional[int] = None,
+    ) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        super().__init__(key)
+        self.qs = tuple(qs)
+        self.k = k
+        self.count = 0
+        self._compactors: List[List[Any]] = []
+        self._size = 0
+        self._max_size = 0
+        self._random = random.Random(seed)
+        self._grow()
+
+    def at(self, q: float) -> "Quantiles[T]":
+        """Reports just the ``q`` quantile from :meth:`result`"""
+        self.qs = (q,)
+        return self
+
+    def add(self, value: T) -> None:
+        self._compactors[0].append(self._value(value))
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def quantile(self, q: float) -> Any:
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        weighted = sorted((v, 1 << h) for h, c in enumerate(self._compactors) for v in c)
+        target = q * sum(w for _, w in weighted)
+        seen = 0
+        for v, w in weighted:
+            seen += w
+            if seen >= target:
+                return v
+        return weighted[-1][0]
+
+    def result(self) -> Any:
+        if len(self.qs) == 1:
+            return self.quantile(self.qs[0])
+        return {q: self.quantile(q) for q in self.qs}
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self._compactors) - height - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._compactors)))
+
+    def _compress(self) -> None:
+        for height, compactor in enumerate(self._compactors):
+            if len(compactor) >= self._capacity(height):
+                if height + 1 >= len(self._compactors):
+                    self._grow()
+                compactor.sort()
+                # keep every other value, starting at random, at twice the weight one level up
+                promoted = compactor[self._random.getrandbits(1) :: 2]
+                self._compactors[height + 1].extend(promoted)
+                self._size += len(promoted) - len(compactor)
+                compactor.clear()
+                break
+
+
+def aggregate(it: Iterable[T], **aggregators: Aggregator[T, Any]) -> Dict[str, Any]:
+    """Feeds every element of ``it`` to each aggregator in a single pass and returns their results by name"""
+    adds = [a.add for a in aggregators.values()]
+    if len(adds) == 1:
+        aggregators[next(iter(aggregators))].update(it)
+    else:
+        for value in it:
+            for add in adds:
+                add(value)
+    return {name: a.result() for name, a in aggregators.items()}
@@ -1,20 +1,39 @@
+import functools
 import hmac
 import os
-from datetime import datetime
+import time
 from hashlib import sha256
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Generator, Iterator, Literal, Optional, Tuple, Union
 from urllib.parse import parse_qsl, urlencode
 
 import httpx
 
+ALGORITHM = "AWS4-HMAC-SHA256"
+EMPTY_SHA256 = sha256(b"").hexdigest()
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+STREAMING_PAYLOAD = "STREAMING-AWS4-HMAC-SHA256-PAYLOAD"
+MIN_CHUNK_SIZE = 8 * 1024
+
+PayloadSigning = Literal["signed", "unsigned", "streaming"]
+
 
 class AwsSigV4Auth(httpx.Auth):
+    """
+    Signs requests with AWS Signature Version 4. ``payload`` picks how the body is covered:
+
+    - ``"signed"`` hashes the whole body into the signature, so httpx has to buffer it first
+    - ``"unsigned"`` sends ``UNSIGNED-PAYLOAD`` and leaves the body alone (S3 over TLS accepts this)
+    - ``"streaming"`` uses S3's ``aws-chunked`` encoding, signing the body ``chunk_size`` bytes at a time
+      as it streams. The request needs a ``Content-Length`` header with the size of the body.
+    """
+
     region: str
     session_token: Optional[str]
     secret_key: str
     access_key: str
     service: str
+    _signing_keys: Optional[Tuple[Tuple[str, str, str, str], bytes]]
 
     def __init__(
         self,
@@ -24,8 +43,19 @@ class AwsSigV4Auth(httpx.Auth):
         secret_key: Optional[str] = None,
         session_token: Optional[str] = None,
         region: Optional[str] = None,
+        payload: PayloadSigning = "signed",
+        chunk_size: int = 64 * 1024,
     ) -> None:
+        if payload not in ("signed", "unsigned", "streaming"):
+            raise ValueError(f"Unknown payload signing {payload!r}")
+        if chunk_size < MIN_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be at least {MIN_CHUNK_SIZE} bytes")
+
         self.service = service
+        self.payload = payload
+        self.chunk_size = chunk_size
+        # only a signed payload needs the body up front; httpx reads streamed bodies in when this is set
+        self.requires_request_body = payload == "signed"
         if access_key is None and secret_key is None:
             access_key, secret_key = get_aws_credentials_from_env()
         if access_key is None or secret_key is None:
@@ -35,51 +65,186 @@ class AwsSigV4Auth(httpx.Auth):
         self.secret_key = secret_key or ""
         self.session_token = session_token or os.getenv("AWS_SESSION_TOKEN", None)
         self.region = region or os.getenv("AWS_DEFAULT_REGION", "us-east-1")
+        self._signing_keys = None
 
     def auth_flow(self, req: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
         if not self.access_key or not self.secret_key:
             yield req
             return
 
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        self.sign(req)
+        yield req
+
+    def sign(self, req: httpx.Request, timestamp: Optional[str] = None) -> None:
+        timestamp = timestamp or time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        date = timestamp[0:8]
         req.headers["X-Amz-Date"] = timestamp
 
         if self.session_token:
             req.headers["X-Amz-Security-Token"] = self.session_token
 
-        params: Dict[str, Any] = dict(parse_qsl(req.url.query.decode("utf-8"), keep_blank_values=True))
-        query = urlencode(sorted(params.items()))
-
         # https://docs.aws.amazon.com/general/latest/gr/sigv4-create-canonical-request.html
-        canonical_headers = "".join("{0}:{1}\n".format(k.lower(), req.headers[k]) for k in sorted(req.headers))
-        signed_headers = ";".join(k.lower() for k in sorted(req.headers))
-        payload_hash = sha256(req.content).hexdigest()
-        canonical_request = "\n".join(
-            [req.method, req.url.path or "/", query, canonical_headers, signed_headers, payload_hash]
-        )
+        # httpx hands out lowercased names, with repeated headers already joined by ", "
+        if self.payload == "signed":
+            payload_hash = sha256(req.content).hexdigest() if req.content else EMPTY_SHA256
+        elif self.payload == "unsigned":
+            payload_hash = req.headers["X-Amz-Content-Sha256"] = UNSIGNED_PAYLOAD
+        else:
+            payload_hash = req.headers["X-Amz-Content-Sha256"] = STREAMING_PAYLOAD
+            decoded_length = self._prepare_streaming(req)
+
+        headers = sorted(req.headers.items())
+        canonical_headers = "".join(f"{k}:{v}\n" for k, v in headers)
+        signed_headers = ";".join(k for k, _ in headers)
+        query = _canonical_query(req.url.query)
+        path = req.url.path or "/"
+        canonical_request = f"{req.method}\n{path}\n{query}\n{canonical_headers}\n{signed_headers}\n{payload_hash}"
 
         # https://docs.aws.amazon.com/general/latest/gr/sigv4-create-string-to-sign.html
-        algorithm = "AWS4-HMAC-SHA256"
-        credential_scope = "/".join([timestamp[0:8], self.region, self.service, "aws4_request"])
+        credential_scope = f"{date}/{self.region}/{self.service}/aws4_request"
         canonical_request_hash = sha256(canonical_request.encode("utf-8")).hexdigest()
-        string_to_sign = "\n".join([algorithm, timestamp, credential_scope, canonical_request_hash])
+        string_to_sign = f"{ALGORITHM}\n{timestamp}\n{credential_scope}\n{canonical_request_hash}"
 
         # https://docs.aws.amazon.com/general/latest/gr/sigv4-calculate-signature.html
+        key = self._signing_key(date)
+        signature = hmac.new(key, string_to_sign.encode("utf-8"), sha256).hexdigest()
+
+        # https://docs.aws.amazon.com/general/latest/gr/sigv4-add-signature-to-request.html
+        req.headers["X-Amz-Content-Sha256"] = payload_hash
+        req.headers["Authorization"] = (
+            f"{ALGORITHM} Credential={self.access_key}/{credential_scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+
+        if self.payload == "streaming":
+            req.stream = AwsChunkedStream(
+                req.stream, key, timestamp, credential_scope, signature, self.chunk_size, decoded_length
+            )
+
+    def _prepare_streaming(self, req: httpx.Request) -> int:
+        """Sets the aws-chunked headers, which are part of the signature; returns the size of the body"""
+        # https://docs.aws.amazon.com/AmazonS3/latest/API/sigv4-streaming.html
+        if "Content-Length" not in req.headers:
+            raise ValueError("Streaming payload signing needs a Content-Length header with the size of the body")
+
+        decoded_length = int(req.headers["Content-Length"])
+        encoding = req.headers.get("Content-Encoding")
+        req.headers["Content-Encoding"] = f"aws-chunked,{encoding}" if encoding else "aws-chunked"
+        req.headers["X-Amz-Decoded-Content-Length"] = str(decoded_length)
+        req.headers["Content-Length"] = str(aws_chunked_length(decoded_length, self.chunk_size))
+        req.headers.pop("Transfer-Encoding", None)
+        return decoded_length
+
+    def _signing_key(self, date: str) -> bytes:
+        """The signing key for ``date``, derived again only when the date, region, service or secret change"""
+        scope = (date, self.region, self.service, self.secret_key)
+        cached = self._signing_keys
+        if cached is not None and cached[0] == scope:
+            return cached[1]
+
         key = "AWS4{0}".format(self.secret_key).encode("utf-8")
-        key = hmac.new(key, timestamp[0:8].encode("utf-8"), sha256).digest()
+        key = hmac.new(key, date.encode("utf-8"), sha256).digest()
         key = hmac.new(key, self.region.encode("utf-8"), sha256).digest()
         key = hmac.new(key, self.service.encode("utf-8"), sha256).digest()
         key = hmac.new(key, "aws4_request".encode("utf-8"), sha256).digest()
-        signature = hmac.new(key, string_to_sign.encode("utf-8"), sha256).hexdigest()
+        # a single tuple assignment, so threads signing concurrently never see a half-updated cache
+        self._signing_keys = (scope, key)
+        return key
 
-        # https://docs.aws.amazon.com/general/latest/gr/sigv4-add-signature-to-request.html
-        authorization = "{0} Credential={1}/{2}, SignedHeaders={3}, Signature={4}".format(
-            algorithm, self.access_key, credential_scope, signed_headers, signature,
-        )
 
-        req.headers["X-Amz-Content-Sha256"] = payload_hash
-        req.headers["Authorization"] = authorization
-        yield req
+def aws_chunked_length(decoded_length: int, chunk_size: int) -> int:
+    """The size of a ``decoded_length`` byte body once aws-chunked encoded in ``chunk_size`` chunks"""
+    full, rest = divmod(decoded_length, chunk_size)
+    sizes = [chunk_size] * full + ([rest] if rest else []) + [0]
+    return sum(len(f"{size:x}") + len(";chunk-signature=") + 64 + 2 + size + 2 for size in sizes)
+
+
+class AwsChunkedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Re-cuts a request body into ``chunk_size`` chunks and frames each one with its signature, chained
+    from the request's seed ``signature``, as it streams; works for sync and async bodies alike.
+    """
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        key: bytes,
+        timestamp: str,
+        credential_scope: str,
+        signature: str,
+        chunk_size: int,
+        decoded_length: int,
+    ) -> None:
+        self.stream = stream
+        self.key = key
+        self.prefix = f"{ALGORITHM}-PAYLOAD\n{timestamp}\n{credential_scope}\n"
+        self.seed = signature
+        self.chunk_size = chunk_size
+        self.decoded_length = decoded_length
+
+    def __iter__(self) -> Iterator[bytes]:
+        signer = _ChunkSigner(self)
+        for data in self.stream:  # type: ignore[union-attr]
+            yield from signer.feed(data)
+        yield from signer.finish()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        signer = _ChunkSigner(self)
+        async for data in self.stream:  # type: ignore[union-attr]
+            for chunk in signer.feed(data):
+                yield chunk
+        for chunk in signer.finish():
+            yield chunk
+
+    def close(self) -> None:
+        if isinstance(self.stream, httpx.SyncByteStream):
+            self.stream.close()
+
+    async def aclose(self) -> None:
+        if isinstance(self.stream, httpx.AsyncByteStream):
+            await self.stream.aclose()
+
+
+class _ChunkSigner:
+    """The state of one pass over an :class:`AwsChunkedStream`: buffered bytes and the previous signature"""
+
+    def __init__(self, stream: AwsChunkedStream) -> None:
+        self.stream = stream
+        self.previous = stream.seed
+        self.buffer = bytearray()
+        self.sent = 0
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        self.buffer += data
+        size = self.stream.chunk_size
+        while len(self.buffer) >= size:
+            chunk = bytes(self.buffer[:size])
+            del self.buffer[:size]
+            yield self.frame(chunk)
+
+    def finish(self) -> Iterator[bytes]:
+        if self.sent + len(self.buffer) != self.stream.decoded_length:
+            raise ValueError(
+                f"Body was {self.sent + len(self.buffer)} bytes, but Content-Length said {self.stream.decoded_length}"
+            )
+        if self.buffer:
+            yield self.frame(bytes(self.buffer))
+            self.buffer.clear()
+        yield self.frame(b"")
+
+    def frame(self, chunk: bytes) -> bytes:
+        string_to_sign = f"{self.stream.prefix}{self.previous}\n{EMPTY_SHA256}\n{sha256(chunk).hexdigest()}"
+        self.previous = hmac.new(self.stream.key, string_to_sign.encode("utf-8"), sha256).hexdigest()
+        self.sent += len(chunk)
+        return b"%x;chunk-signature=%s\r\n%s\r\n" % (len(chunk), self.previous.encode("ascii"), chunk)
+
+
+@functools.lru_cache(maxsize=256)
+def _canonical_query(query: bytes) -> str:
+    if not query:
+        return ""
+    params: Dict[str, Any] = dict(parse_qsl(query.decode("utf-8"), keep_blank_values=True))
+    return urlencode(sorted(params.items()))
 
 
 def get_aws_credentials_from_env() -> Tuple[Optional[str], Optional[str]]:
@@ -1,8 +1,25 @@
+import asyncio
+import contextlib
+import functools
+import math
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Callable, Generic, Optional, Tuple, Union, cast, overload
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, Union, cast, overload
 
 from cbtoolz.funcutils import func_partial
-from cbtoolz.types import UNSET, P, T, Unset
+from cbtoolz.hashutils import hash_objects, stable_hash, to_qualified_name
+from cbtoolz.types import KT, UNSET, VT, P, R, T, Unset
 
 
 class Result(Generic[T]):
@@ -13,29 +30,569 @@ class Result(Generic[T]):
 GetterResult = Union[Tuple[T, Union[datetime, int, None]], Result[T], T]
 
 
-class Cached(Generic[T]):
-    _fn: Callable[[], GetterResult[T]]
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SingleFlight(Generic[KT]):
+    """
+    Collapses concurrent calls for the same key into a single execution. Callers that arrive while
+    a call for their key is in flight wait for (and share) its result instead of running ``fn`` again.
+    """
+
+    _calls: Dict[KT, "Future[Any]"]
+    _acalls: Dict[Tuple[asyncio.AbstractEventLoop, KT], "asyncio.Future[Any]"]
+    _tasks: Set["asyncio.Task[Any]"]
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._acalls = {}
+        self._tasks = set()
+
+    def do(self, key: KT, fn: Callable[[], R]) -> R:
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+
+        self._run(key, future, fn)
+        return future.result()
+
+    def start(self, key: KT, fn: Callable[[], R]) -> "Future[R]":
+        """Runs ``fn`` on a background thread unless a call for ``key`` is already in flight"""
+        future, leader = self._claim(key)
+        if leader:
+            threading.Thread(target=self._run, args=(key, future, fn), daemon=True).start()
+        return future
+
+    async def ado(self, key: KT, fn: Callable[[], Awaitable[R]]) -> R:
+        loop = asyncio.get_running_loop()
+        future = self._acalls.get((loop, key))
+        while future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # the leader was cancelled rather than this caller: the first follower to wake takes over
+            future = self._acalls.get((loop, key))
+
+        future = self._acalls[(loop, key)] = loop.create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark as retrieved so an unobserved failure isn't logged twice
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._acalls[(loop, key)]
+
+    def astart(self, key: KT, fn: Callable[[], Awaitable[R]]) -> "asyncio.Future[R]":
+        """Schedules ``fn`` on the running loop unless a call for ``key`` is already in flight"""
+        loop = asyncio.get_running_loop()
+        future = self._acalls.get((loop, key))
+        if future is not None:
+            return future
+
+        task = loop.create_task(self.ado(key, fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: "asyncio.Task[Any]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def _claim(self, key: KT) -> Tuple["Future[Any]", bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _run(self, key: KT, future: "Future[R]", fn: Callable[[], R]) -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._calls
+
+
+class _Entry(Generic[VT]):
+    __slots__ = ("value", "deadline", "size", "stored")
+
+    def __init__(self, value: VT, deadline: Optional[float], size: int) -> None:
+        self.value = value
+        self.deadline = deadline
+        self.size = size
+        self.stored = time.monotonic()
+
+
+_DISK_MAGIC = b"CBC1"
+_DISK_HEADER = struct.Struct("<4sdd")
+
+
+class DiskStore(Generic[KT, VT]):
+    """
+    A persistent cache tier that pickles each entry into its own file under ``directory``, named by
+    the hash of its key, and reads entries back through ``mmap``. Writes go to a temporary file that
+    is atomically renamed into place, so several processes can share one directory. Entries store
+    wall-clock timestamps on disk but, like :class:`CacheStore`, take and return ``time.monotonic()``
+    deadlines. Only point it at a directory you trust: entries are unpickled on read.
+
+    Keys from :func:`cached` and :func:`acached` lead with the function's qualified name, so functions
+    sharing a directory keep separate entries; ``namespace`` separates other users of one directory.
+
+    As in :class:`CacheStore`, expired entries go first when the limits are exceeded, and only then the
+    least recently used. Expired files are also swept out every ``sweep_interval`` seconds (checked on
+    writes), so they don't pile up in a directory without limits.
+    """
+
+    _stats: CacheStats
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        *,
+        namespace: str = "",
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = 600.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def path(self, key: KT) -> Path:
+        digest = hash_objects(key) or stable_hash(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL))
+        return self.directory / stable_hash(self.namespace, digest)
+
+    def load(self, key: KT) -> Optional[Tuple[VT, Optional[float], float]]:
+        """Returns ``(value, deadline, stored)`` for ``key`` (expired or not) or ``None`` if there is no entry"""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, stored, expires = _DISK_HEADER.unpack_from(mm)
+                if magic != _DISK_MAGIC:
+                    return None
+                with memoryview(mm)[_DISK_HEADER.size :] as payload:
+                    value = pickle.loads(payload)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, struct.error):
+            return None
+
+        # touch the file so eviction can approximate LRU order from mtimes
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        now, mono = time.time(), time.monotonic()
+        deadline = None if math.isinf(expires) else mono + (expires - now)
+        return value, deadline, mono + (stored - now)
+
+    def lookup(self, key: KT, *, record: bool = True) -> Tuple[Union[VT, Unset], bool]:
+        loaded = self.load(key)
+        fresh = loaded is not None and (loaded[1] is None or loaded[1] >= time.monotonic())
+        if record:
+            with self._lock:
+                if fresh:
+                    self._stats.hits += 1
+                else:
+                    self._stats.misses += 1
+        return (loaded[0], fresh) if loaded is not None else (UNSET, False)
+
+    def get(self, key: KT, default: Union[VT, Unset] = UNSET) -> Union[VT, Unset]:
+        value, fresh = self.lookup(key)
+        if fresh:
+            return value
+        if value is not UNSET:
+            self.discard(key)
+            with self._lock:
+                self._stats.expirations += 1
+        return default
+
+    def set(self, key: KT, value: VT, deadline: Optional[float] = None) -> None:
+        now = time.time()
+        expires = math.inf if deadline is None else now + (deadline - time.monotonic())
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_DISK_HEADER.pack(_DISK_MAGIC, now, expires))
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+        if self.max_entries is not None or self.max_bytes is not None:
+            self._cull()
+        elif self.sweep_interval is not None and time.monotonic() >= self._next_sweep:
+            self.sweep()
+
+    def sweep(self) -> None:
+        """Removes every expired entry"""
+        self._next_sweep = time.monotonic() + (self.sweep_interval or 0)
+        now = time.time()
+        for entry in self._scan():
+            if self._expired(entry.path, now):
+                self._remove(entry.path, expired=True)
+
+    def discard(self, key: KT) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path(key))
+
+    def clear(self) -> None:
+        for entry in self._scan():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry.path)
+
+    def _scan(self) -> List[os.DirEntry]:
+        return [e for e in os.scandir(self.directory) if not e.name.startswith(".") and e.is_file()]
+
+    def _cull(self) -> None:
+        entries: List[Tuple[float, int, str]] = []
+        for entry in self._scan():
+            with contextlib.suppress(FileNotFoundError):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+
+        def over_limit() -> bool:
+            return (self.max_entries is not None and count > self.max_entries) or (
+                self.max_bytes is not None and total > self.max_bytes
+            )
+
+        if not over_limit():
+            return
+
+        # drop anything that has already expired before sacrificing live entries, then the least recently used
+        now = time.time()
+        live = []
+        for mtime, size, path in entries:
+            if not self._expired(path, now):
+                live.append((mtime, size, path))
+            elif self._remove(path, expired=True):
+                total -= size
+                count -= 1
+        self._next_sweep = time.monotonic() + (self.sweep_interval or 0)
+
+        for mtime, size, path in sorted(live):
+            if not over_limit():
+                break
+            if self._remove(path, expired=False):
+                total -= size
+                count -= 1
+
+    def _remove(self, path: str, *, expired: bool) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # another process got there first
+            return False
+        with self._lock:
+            if expired:
+                self._stats.expirations += 1
+            else:
+                self._stats.evictions += 1
+        return True
+
+    def _expired(self, path: str, now: float) -> bool:
+        try:
+            with open(path, "rb") as f:
+                _, _, expires = _DISK_HEADER.unpack(f.read(_DISK_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        return expires < now
+
+    def __contains__(self, key: object) -> bool:
+        return self.lookup(cast(KT, key), record=False)[1]
+
+    def __len__(self) -> int:
+        return len(self._scan())
+
+    def __repr__(self) -> str:
+        return f"<DiskStore {str(self.directory)!r} {self._stats}>"
+
+
+class CacheStore(Generic[KT, VT]):
+    """
+    A thread-safe keyed store with LRU eviction, per-entry expiration and optional limits on
+    the number of entries and on the total size of the stored values (as measured by ``sizeof``).
+    Expiration deadlines are ``time.monotonic()`` timestamps.
+
+    With a ``tier`` (e.g. a :class:`DiskStore`) every write is also written through to it, and
+    misses in memory are served from it when it holds the key.
+    """
+
+    _entries: "OrderedDict[KT, _Entry[VT]]"
+    _lock: threading.RLock
+    _nbytes: int
+    _stats: CacheStats
+
+    def __init__(
+        self,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        tier: Optional[DiskStore[KT, VT]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.tier = tier
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._nbytes = 0
+        self._stats = CacheStats()
+        self.flight: SingleFlight[KT] = SingleFlight()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def get(self, key: KT, default: Union[VT, Unset] = UNSET) -> Union[VT, Unset]:
+        entry = self._entry(key)
+        with self._lock:
+            if entry is not None and entry.deadline is not None and entry.deadline < time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                if self.tier is not None:
+                    self.tier.discard(key)
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return default
+
+            self._touch(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def lookup(self, key: KT, *, record: bool = True) -> Tuple[Union[VT, Unset], bool]:
+        """Returns ``(value, fresh)`` for ``key``, keeping (and returning) values that have expired"""
+        entry = self._entry(key)
+        with self._lock:
+            if entry is None:
+                if record:
+                    self._stats.misses += 1
+                return UNSET, False
+
+            fresh = entry.deadline is None or entry.deadline >= time.monotonic()
+            self._touch(key)
+            if record:
+                if fresh:
+                    self._stats.hits += 1
+                else:
+                    self._stats.misses += 1
+            return entry.value, fresh
+
+    def set(self, key: KT, value: VT, deadline: Optional[float] = None) -> None:
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._insert(key, _Entry(value, deadline, size))
+        if self.tier is not None:
+            self.tier.set(key, value, deadline)
+
+    def _entry(self, key: KT) -> Optional[_Entry[VT]]:
+        entry = self._entries.get(key)
+        if entry is None and self.tier is not None:
+            loaded = self.tier.load(key)
+            if loaded is not None:
+                value, deadline, stored = loaded
+                entry = _Entry(value, deadline, self.sizeof(value) if self.max_bytes is not None else 0)
+                entry.stored = stored
+                with self._lock:
+                    self._insert(key, entry)
+        return entry
+
+    def _insert(self, key: KT, entry: _Entry[VT]) -> None:
+        self._remove(key)
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._nbytes += entry.size
+        self._evict()
+
+    def _touch(self, key: KT) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def peek(self, key: KT, default: Union[VT, Unset] = UNSET) -> Union[VT, Unset]:
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else default
+
+    def deadline(self, key: KT) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry.deadline if entry is not None else None
+
+    def expiration(self, key: KT) -> Optional[datetime]:
+        deadline = self.deadline(key)
+        return _to_datetime(deadline) if deadline is not None else None
+
+    def stored_at(self, key: KT) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry.stored if entry is not None else None
+
+    def discard(self, key: KT) -> None:
+        with self._lock:
+            self._remove(key)
+        if self.tier is not None:
+            self.tier.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+        if self.tier is not None:
+            self.tier.clear()
+
+    def _remove(self, key: KT) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.size
+
+    def _over_limit(self) -> bool:
+        return (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+            self.max_bytes is not None and self._nbytes > self.max_bytes
+        )
+
+    def _evict(self) -> None:
+        if not self._over_limit():
+            return
+
+        # drop anything that has already expired before sacrificing live entries
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.deadline is not None and e.deadline < now]:
+            self._remove(key)
+            self._stats.expirations += 1
+
+        while self._over_limit():
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats.evictions += 1
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(cast(KT, key))
+        return entry is not None and (entry.deadline is None or entry.deadline >= time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<CacheStore entries={len(self)} bytes={self._nbytes} {self._stats}>"
+
+
+def _to_deadline(expiration: datetime) -> float:
+    return time.monotonic() + (expiration.timestamp() - time.time())
+
+
+def _to_datetime(deadline: float) -> datetime:
+    return datetime.now() + timedelta(seconds=deadline - time.monotonic())
+
+
+def _parse_result(result: GetterResult[T], default_ttl: Optional[int]) -> Tuple[T, Optional[float]]:
+    if isinstance(result, tuple):
+        if len(result) == 2 and (isinstance(result[1], int) or result[1] is None):
+            value = cast(T, result[0])
+            ttl = cast(Optional[int], result[1])
+            deadline = time.monotonic() + ttl if ttl else None
+        elif isinstance(result[1], datetime):
+            value = result[0]
+            deadline = _to_deadline(result[1])
+        else:
+            value, deadline = result, None
+    elif isinstance(result, Result):
+        value, deadline = result.value, time.monotonic() + result.ttl if result.ttl else None
+    else:
+        value, deadline = result, None
+
+    if deadline is None and default_ttl is not None:
+        deadline = time.monotonic() + default_ttl
+
+    return cast(T, value), deadline
+
+
+class _BaseCached(Generic[T]):
     _value: Union[Optional[T], Unset]
-    _expires: Optional[datetime]
+    _deadline: Optional[float]
+    _stored: Optional[float]
     _ttl: Optional[int] = None
     _name: str
+    _store: Optional[CacheStore[Hashable, Any]]
+    _key: Hashable
+    _serve_stale: bool
 
     def __init__(
-        self, fn: Callable[[], GetterResult[T]], *, name: Optional[str] = None, ttl: Optional[int] = None
+        self,
+        name: str,
+        *,
+        ttl: Optional[int] = None,
+        store: Optional[CacheStore[Hashable, Any]] = None,
+        key: Hashable = None,
+        serve_stale: bool = False,
     ) -> None:
-        self._fn = fn
         self._value = UNSET
         self._ttl = ttl
-        self._expires = datetime.utcnow() + timedelta(seconds=ttl) if ttl else None
-        self._name = name or fn.__name__
+        self._deadline = None
+        self._stored = None
+        self._name = name
+        self._store = store
+        self._key = key
+        self._serve_stale = serve_stale
 
     @property
-    def expiration(self) -> Optional[datetime]:
-        return self._expires
+    def deadline(self) -> Optional[float]:
+        if self._store is not None:
+            return self._store.deadline(self._key)
+        return self._deadline
 
     @property
-    def value(self) -> T:
-        return self()
+    def expiration(self) -> Optional[datetime]:
+        deadline = self.deadline
+        return _to_datetime(deadline) if deadline is not None else None
 
     @property
     def name(self) -> str:
@@ -43,60 +600,282 @@ class Cached(Generic[T]):
 
     @property
     def ttl(self) -> Optional[int]:
-        return int((self.expiration - datetime.utcnow()).total_seconds()) if self.expiration is not None else None
+        deadline = self.deadline
+        return int(deadline - time.monotonic()) if deadline is not None else None
+
+    def _lookup(self, record: bool = True) -> Tuple[Union[T, Unset], bool]:
+        if self._store is not None:
+            return self._store.lookup(self._key, record=record)
+        if self._value is UNSET:
+            return UNSET, False
+        return cast(T, self._value), self._deadline is None or self._deadline >= time.monotonic()
+
+    def _put(self, value: T, deadline: Optional[float]) -> None:
+        if self._store is not None:
+            self._store.set(self._key, value, deadline)
+        else:
+            self._value, self._deadline, self._stored = value, deadline, time.monotonic()
+
+    def __repr__(self) -> str:
+        expires = self.expiration
+        value = self._store.peek(self._key) if self._store is not None else self._value
+        expiration = f"expires {expires.isoformat()}" if expires is not None else "non-expiring"
+        return f"<{type(self).__name__} {self.name!r}={value!r}, {expiration}>"
+
+
+class Cached(_BaseCached[T]):
+    _fn: Callable[[], GetterResult[T]]
+    _flight: Optional[SingleFlight[Hashable]]
+    _background: SingleFlight[Hashable]
+
+    def __init__(
+        self,
+        fn: Callable[[], GetterResult[T]],
+        *,
+        name: Optional[str] = None,
+        ttl: Optional[int] = None,
+        store: Optional[CacheStore[Hashable, Any]] = None,
+        key: Hashable = None,
+        single_flight: bool = True,
+        serve_stale: bool = False,
+    ) -> None:
+        super().__init__(name or fn.__name__, ttl=ttl, store=store, key=key, serve_stale=serve_stale)
+        self._fn = fn
+        # background refreshes of a stale value are always collapsed, even when callers that have to wait aren't
+        self._background = store.flight if store is not None else SingleFlight()
+        self._flight = self._background if single_flight else None
+
+    @property
+    def value(self) -> T:
+        return self()
 
     def __call__(self) -> T:
-        if self._value is UNSET or (self._expires is not None and self._expires < datetime.now()):
-            result = self._fn()
-            if isinstance(result, tuple):
-                if len(result) == 2 and (isinstance(result[1], int) or result[1] is None):
-                    value = cast(T, result[0])
-                    ttl = cast(Optional[int], result[1])
-                    expiration = datetime.now() + timedelta(seconds=ttl) if ttl else None
-                elif isinstance(result[1], datetime):
-                    value = result[0]
-                    expiration = cast(datetime, result[1])
-                else:
-                    value, expiration = result, None
-            elif isinstance(result, Result):
-                value, expiration = result.value, datetime.now() + timedelta(seconds=result.ttl) if result.ttl else None
-            else:
-                value, expiration = result, None
+        value, fresh = self._lookup()
+        if fresh:
+            return cast(T, value)
 
-            if expiration is None and self._ttl is not None:
-                expiration = datetime.now() + timedelta(seconds=self._ttl)
+        if value is not UNSET and self._serve_stale:
+            # a failed background refresh leaves the stale value in place and is retried on the next call
+            self._background.start(self._key, self._refresh)
+            return cast(T, value)
 
-            self._value = value
-            self._expires = expiration
+        if self._flight is None:
+            return self._refresh()
+        return self._flight.do(self._key, self._refresh)
 
-        return cast(T, self._value)
+    def _refresh(self) -> T:
+        # another caller may have refreshed the value while we were waiting to lead
+        value, fresh = self._lookup(record=False)
+        if fresh:
+            return cast(T, value)
 
-    def __repr__(self) -> str:
-        expiration = f"expires {self._expires.isoformat()}" if self._expires is not None else "non-expiring"
-        return f"<Cached {self.name!r}={self._value!r}, {expiration}>"
+        value, deadline = _parse_result(self._fn(), self._ttl)
+        self._put(value, deadline)
+        return value
+
+
+class AsyncCached(_BaseCached[T]):
+    """
+    The coroutine counterpart of :class:`Cached`. With ``refresh_ahead`` set to a fraction of the
+    entry's lifetime (e.g. ``0.8``), a hit on an entry past that point schedules a refresh on the
+    running event loop and keeps serving the current value until the refresh lands.
+    """
+
+    _fn: Callable[[], Awaitable[GetterResult[T]]]
+    _flight: SingleFlight[Hashable]
+    _refresh_ahead: Optional[float]
+
+    def __init__(
+        self,
+        fn: Callable[[], Awaitable[GetterResult[T]]],
+        *,
+        name: Optional[str] = None,
+        ttl: Optional[int] = None,
+        store: Optional[CacheStore[Hashable, Any]] = None,
+        key: Hashable = None,
+        serve_stale: bool = False,
+        refresh_ahead: Optional[float] = None,
+    ) -> None:
+        if refresh_ahead is not None and not 0 < refresh_ahead < 1:
+            raise ValueError("refresh_ahead must be a fraction between 0 and 1")
+
+        super().__init__(name or fn.__name__, ttl=ttl, store=store, key=key, serve_stale=serve_stale)
+        self._fn = fn
+        self._flight = store.flight if store is not None else SingleFlight()
+        self._refresh_ahead = refresh_ahead
+
+    @property
+    def value(self) -> Awaitable[T]:
+        return self()
+
+    async def __call__(self) -> T:
+        value, fresh = self._lookup()
+        if fresh:
+            if self._refresh_ahead is not None and self._refresh_due():
+                self._flight.astart(self._key, self._reload)
+            return cast(T, value)
+
+        if value is not UNSET and self._serve_stale:
+            self._flight.astart(self._key, self._refresh)
+            return cast(T, value)
+
+        return await self._flight.ado(self._key, self._refresh)
+
+    def _refresh_due(self) -> bool:
+        deadline = self.deadline
+        stored = self._store.stored_at(self._key) if self._store is not None else self._stored
+        if deadline is None or stored is None:
+            return False
+        return time.monotonic() >= stored + (deadline - stored) * cast(float, self._refresh_ahead)
+
+    async def _refresh(self) -> T:
+        value, fresh = self._lookup(record=False)
+        if fresh:
+            return cast(T, value)
+        return await self._reload()
+
+    async def _reload(self) -> T:
+        value, deadline = _parse_result(await self._fn(), self._ttl)
+        self._put(value, deadline)
+        return value
+
+
+def make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """
+    Keys a call as ``(args, sorted kwargs items)``, which :func:`~cbtoolz.hashutils.canonical_hash` can
+    encode the same way in every process; unhashable arguments (lists, dicts, ...) are keyed by a digest
+    of their contents instead, a string that can't be mistaken for the tuple form.
+    """
+    key = (args, tuple(sorted(kwargs.items())) if kwargs else ())
+    try:
+        hash(key)
+    except TypeError:
+        digest = hash_objects(*args, **kwargs)
+        if digest is None:
+            raise
+        return digest
+    return key
 
 
 def cache(fn: Callable[P, GetterResult[T]], *args: P.args, **kwargs: P.kwargs) -> Cached[T]:
     return Cached(func_partial(fn, *args, **kwargs))
 
 
+def acache(fn: Callable[P, Awaitable[GetterResult[T]]], *args: P.args, **kwargs: P.kwargs) -> AsyncCached[T]:
+    return AsyncCached(func_partial(fn, *args, **kwargs))
+
+
 @overload
 def cached(getter: Callable[P, GetterResult[T]], /) -> Callable[P, Cached[T]]:
     ...
 
 
 @overload
-def cached(*, ttl: Optional[int] = None) -> Callable[[Callable[P, T]], Callable[P, Cached[T]]]:
+def cached(
+    *,
+    ttl: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    store: Optional[CacheStore[Hashable, Any]] = None,
+    single_flight: bool = True,
+    serve_stale: bool = False,
+) -> Callable[[Callable[P, T]], Callable[P, Cached[T]]]:
     ...
 
 
 def cached(
-    getter: Optional[Callable[P, GetterResult[T]]] = None, *, ttl: Optional[int] = None
+    getter: Optional[Callable[P, GetterResult[T]]] = None,
+    *,
+    ttl: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    store: Optional[CacheStore[Hashable, Any]] = None,
+    single_flight: bool = True,
+    serve_stale: bool = False,
 ) -> Union[Callable[[Callable[P, T]], Callable[P, Cached[T]]], Callable[P, Cached[T]]]:
+    """
+    Wraps ``getter`` so that calling it returns a :class:`Cached` handle backed by a shared
+    :class:`CacheStore` keyed on the function and the call arguments. The store is exposed as ``.cache`` on the
+    returned function.
+
+    With ``single_flight`` only one caller refreshes a missing or expired entry while the others wait
+    for its result; ``serve_stale`` additionally returns the expired value while a background thread
+    refreshes it.
+    """
+
     def decorator(fn: Callable[P, GetterResult[T]]) -> Callable[P, Cached[T]]:
+        cache_store = store if store is not None else CacheStore(max_entries=max_entries, max_bytes=max_bytes)
+        name = fn.__name__
+        # a store (and its single-flight) may be shared by several functions, so keys lead with the function
+        qualified_name = to_qualified_name(fn)
+
+        @functools.wraps(fn)
         def _cached_getter(*args: P.args, **kwargs: P.kwargs) -> Cached[T]:
-            return Cached(func_partial(fn, *args, **kwargs), ttl=ttl)
+            return Cached(
+                functools.partial(fn, *args, **kwargs),
+                name=name,
+                ttl=ttl,
+                store=cache_store,
+                key=(qualified_name, make_key(args, kwargs)),
+                single_flight=single_flight,
+                serve_stale=serve_stale,
+            )
+
+        _cached_getter.cache = cache_store  # type: ignore
+        return _cached_getter
+
+    return decorator(getter) if getter is not None else decorator
+
+
+@overload
+def acached(getter: Callable[P, Awaitable[GetterResult[T]]], /) -> Callable[P, AsyncCached[T]]:
+    ...
+
+
+@overload
+def acached(
+    *,
+    ttl: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    store: Optional[CacheStore[Hashable, Any]] = None,
+    serve_stale: bool = False,
+    refresh_ahead: Optional[float] = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, AsyncCached[T]]]:
+    ...
+
+
+def acached(
+    getter: Optional[Callable[P, Awaitable[GetterResult[T]]]] = None,
+    *,
+    ttl: Optional[int] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    store: Optional[CacheStore[Hashable, Any]] = None,
+    serve_stale: bool = False,
+    refresh_ahead: Optional[float] = None,
+) -> Union[Callable[[Callable[P, Awaitable[T]]], Callable[P, AsyncCached[T]]], Callable[P, AsyncCached[T]]]:
+    """The coroutine counterpart of :func:`cached`, returning :class:`AsyncCached` handles"""
+
+    def decorator(fn: Callable[P, Awaitable[GetterResult[T]]]) -> Callable[P, AsyncCached[T]]:
+        cache_store = store if store is not None else CacheStore(max_entries=max_entries, max_bytes=max_bytes)
+        name = fn.__name__
+        # a store (and its single-flight) may be shared by several functions, so keys lead with the function
+        qualified_name = to_qualified_name(fn)
+
+        @functools.wraps(fn)
+        def _cached_getter(*args: P.args, **kwargs: P.kwargs) -> AsyncCached[T]:
+            return AsyncCached(
+                functools.partial(fn, *args, **kwargs),
+                name=name,
+                ttl=ttl,
+                store=cache_store,
+                key=(qualified_name, make_key(args, kwargs)),
+                serve_stale=serve_stale,
+                refresh_ahead=refresh_ahead,
+            )
 
+        _cached_getter.cache = cache_store  # type: ignore
         return _cached_getter
 
     return decorator(getter) if getter is not None else decorator
@@ -0,0 +1,138 @@
+"""
+A columnar path for numeric pipelines: :meth:`cbtoolz.iterutils.Iter.columnar` buffers elements into
+NumPy arrays of ``block_size`` and the stages below run once per block instead of once per element.
+Requires the ``numpy`` extra.
+"""
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("cbtoolz.columnar requires numpy, install it with the 'numpy' extra") from e
+
+if TYPE_CHECKING:
+    from cbtoolz.iterutils import Iter
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+ArrayFn = Callable[[np.ndarray], np.ndarray]
+
+
+def blocks(it: Iterable[Any], block_size: int = DEFAULT_BLOCK_SIZE, dtype: Any = np.float64) -> Iterator[np.ndarray]:
+    """Packs a stream of numbers into arrays of ``block_size`` (the last one may be shorter)"""
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    it = iter(it)
+    while True:
+        block = np.fromiter(itertools.islice(it, block_size), dtype=dtype)
+        if not len(block):
+            return
+        yield block
+
+
+class ArrayIter:
+    """
+    A stream of 1-d arrays. ``map`` and ``filter`` take vectorized functions (``np.sqrt``,
+    ``lambda a: a * 2``, ``lambda a: a > 0``) that are called on whole blocks; ``accumulate`` carries
+    its running value across block boundaries. Get back to elements with :meth:`scalars` or keep
+    whole arrays with :meth:`arrays`.
+    """
+
+    it: Iterator[np.ndarray]
+
+    def __init__(self, arrays: Iterable[np.ndarray]) -> None:
+        self.it = iter(arrays)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.it
+
+    def __next__(self) -> np.ndarray:
+        return next(self.it)
+
+    def map(self, fn: ArrayFn) -> ArrayIter:
+        return ArrayIter(map(fn, self.it))
+
+    def filter(self, predicate: ArrayFn) -> ArrayIter:
+        """Keeps the elements where ``predicate(block)`` is true, dropping blocks that end up empty"""
+        return ArrayIter(block for block in (b[predicate(b)] for b in self.it) if len(block))
+
+    def accumulate(self, ufunc: np.ufunc = np.add) -> ArrayIter:
+        """Running ``ufunc`` over the whole stream, e.g. ``np.add`` for a cumulative sum or ``np.maximum``"""
+        return ArrayIter(_accumulate(self.it, ufunc))
+
+    def astype(self, dtype: Any) -> ArrayIter:
+        return self.map(lambda block: block.astype(dtype, copy=False))
+
+    def rebatch(self, block_size: int) -> ArrayIter:
+        """Re-cuts the stream into blocks of ``block_size``, e.g. after a selective ``filter``"""
+        return ArrayIter(_rebatch(self.it, block_size))
+
+    def arrays(self) -> Iter[np.ndarray]:
+        from cbtoolz.iterutils import Iter
+
+        return Iter(self.it)
+
+    def scalars(self) -> Iter[Any]:
+        """Back to one Python number per element"""
+        from cbtoolz.iterutils import Iter
+
+        return Iter(itertools.chain.from_iterable(block.tolist() for block in self.it))
+
+    def to_array(self) -> np.ndarray:
+        arrays = list(self.it)
+        return np.concatenate(arrays) if arrays else np.empty(0)
+
+    def sum(self) -> Any:
+        total = _reduce(self.it, np.add)
+        return 0 if total is None else total
+
+    def count(self) -> int:
+        return sum(len(block) for block in self.it)
+
+    def min(self) -> Optional[Any]:
+        return _reduce(self.it, np.minimum)
+
+    def max(self) -> Optional[Any]:
+        return _reduce(self.it, np.maximum)
+
+
+def _accumulate(it: Iterator[np.ndarray], ufunc: np.ufunc) -> Iterator[np.ndarray]:
+    carry: Union[None, np.generic] = None
+    for block in it:
+        if not len(block):
+            continue
+        out = ufunc.accumulate(block)
+        if carry is not None:
+            out = ufunc(carry, out, out=out)
+        carry = out[-1]
+        yield out
+
+
+def _rebatch(it: Iterator[np.ndarray], block_size: int) -> Iterator[np.ndarray]:
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    pending = []
+    buffered = 0
+    for block in it:
+        pending.append(block)
+        buffered += len(block)
+        if buffered >= block_size:
+            joined = np.concatenate(pending)
+            full = len(joined) - len(joined) % block_size
+            yield from np.split(joined[:full], full // block_size)
+            pending = [joined[full:]]
+            buffered = len(pending[0])
+    if buffered:
+        yield np.concatenate(pending)
+
+
+def _reduce(it: Iterator[np.ndarray], ufunc: np.ufunc) -> Optional[Any]:
+    result = None
+    for block in it:
+        if len(block):
+            value = ufunc.reduce(block)
+            result = value if result is None else ufunc(result, value)
+    return None if result is None else result.item()
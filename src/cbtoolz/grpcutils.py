@@ -1,10 +1,37 @@
 from __future__ import annotations
 
-from typing import AsyncIterator, Awaitable, Callable, Iterator, Protocol, TypeVar, runtime_checkable
+import asyncio
+import operator
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    runtime_checkable,
+)
 
 from typing_extensions import Concatenate
 
-from cbtoolz.types import P
+from cbtoolz.iterutils import AsyncIter, Iter, prefetch
+from cbtoolz.types import P, T
 
 
 @runtime_checkable
@@ -21,27 +48,468 @@ class PageableResponse(Protocol):
 GrpcRequest = TypeVar("GrpcRequest", bound=PageableRequest)
 GrpcResponse = TypeVar("GrpcResponse", bound=PageableResponse)
 
+PageField = Union[str, Callable[[GrpcResponse], Iterable[T]]]
 
-async def async_pager(
+
+_RETRYABLE_CODES = frozenset({"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED", "ABORTED"})
+
+
+def is_transient_rpc_error(error: BaseException) -> bool:
+    """Whether ``error`` is a ``grpc.RpcError`` with a status code that is usually worth retrying"""
+    code = getattr(error, "code", None)
+    if not callable(code):
+        return False
+    try:
+        status = code()
+    except Exception:
+        return False
+    return getattr(status, "name", None) in _RETRYABLE_CODES
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How pagers retry a failed page call: up to ``attempts`` calls per page, sleeping a random
+    ("full jitter") time of up to ``initial_backoff * multiplier ** retry`` seconds, capped at
+    ``max_backoff``, in between. An error is retried if it is one of ``retry_on`` or a transient
+    gRPC status (see :func:`is_transient_rpc_error`), or, when given, if ``retryable`` says so.
+    """
+
+    attempts: int = 5
+    initial_backoff: float = 0.1
+    max_backoff: float = 10.0
+    multiplier: float = 2.0
+    retry_on: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError)
+    retryable: Optional[Callable[[BaseException], bool]] = None
+
+    def __post_init__(self) -> None:
+        if self.attempts < 1:
+            raise ValueError("attempts must be at least 1")
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether to try again after the ``attempt``-th call (counting from 1) raised ``error``"""
+        if attempt >= self.attempts or not isinstance(error, Exception):
+            return False
+        if self.retryable is not None:
+            return self.retryable(error)
+        return isinstance(error, self.retry_on) or is_transient_rpc_error(error)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1)))
+
+
+class _PagerState(Generic[GrpcRequest]):
+    """Token and deadline bookkeeping shared by :class:`Pager` and :class:`AsyncPager`"""
+
+    def __init__(
+        self,
+        request: GrpcRequest,
+        kwargs: Dict[str, Any],
+        retry: Optional[RetryPolicy],
+        deadline: Optional[float],
+        timeout_arg: Optional[str],
+    ) -> None:
+        self.request = request
+        self.kwargs = kwargs
+        self.retry = retry
+        self.deadline = None if deadline is None else time.monotonic() + deadline
+        self.timeout_arg = timeout_arg
+        self.done = False
+        self.pages = 0
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def call_kwargs(self) -> Dict[str, Any]:
+        """The keyword arguments for the next call, with what's left of the deadline as its timeout"""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise TimeoutError(f"Pager deadline exceeded after {self.pages} pages")
+        if remaining is None or self.timeout_arg is None:
+            return self.kwargs
+        return {**self.kwargs, self.timeout_arg: remaining}
+
+    def delay(self, error: BaseException, attempt: int) -> float:
+        """How long to wait before retrying after ``error``; re-raises it if it shouldn't be retried"""
+        if self.retry is None or not self.retry.should_retry(error, attempt):
+            raise error
+        delay = self.retry.backoff(attempt)
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            raise error
+        return delay
+
+    def advance(self, response: GrpcResponse) -> GrpcResponse:
+        self.request.page_token = response.next_page_token
+        self.done = not response.next_page_token
+        self.pages += 1
+        return response
+
+
+class Pager(Iterator[GrpcResponse], Generic[GrpcRequest, GrpcResponse]):
+    """
+    Iterates the pages of a list RPC, following ``next_page_token``. With ``page_retry`` a failed page
+    is retried (with backoff) from the same token instead of ending the walk, and ``page_deadline``
+    bounds the whole walk in seconds; what's left of it is passed to each call as ``page_timeout_arg``
+    (``"timeout"`` for gRPC stubs). Other keyword arguments, ``retry=`` and ``timeout=`` included, go to
+    the RPC as they are. The :attr:`resume_token` property is the token of the next page to fetch:
+    persist it and set it as the request's ``page_token`` to continue an interrupted walk.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., GrpcResponse],
+        request: GrpcRequest,
+        *args: Any,
+        page_retry: Optional[RetryPolicy] = None,
+        page_deadline: Optional[float] = None,
+        page_timeout_arg: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.fn = fn
+        self.args = args
+        self._state = _PagerState(request, kwargs, page_retry, page_deadline, page_timeout_arg)
+
+    @property
+    def resume_token(self) -> Optional[str]:
+        """The page token to continue from, or ``None`` once every page has been fetched"""
+        return None if self._state.done else self._state.request.page_token
+
+    @property
+    def pages(self) -> int:
+        return self._state.pages
+
+    def __iter__(self) -> Pager[GrpcRequest, GrpcResponse]:
+        return self
+
+    def __next__(self) -> GrpcResponse:
+        state = self._state
+        if state.done:
+            raise StopIteration
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.fn(state.request, *self.args, **state.call_kwargs())
+            except Exception as e:
+                time.sleep(state.delay(e, attempt))
+            else:
+                return state.advance(response)
+
+
+class AsyncPager(AsyncIterator[GrpcResponse], Generic[GrpcRequest, GrpcResponse]):
+    """The asyncio counterpart of :class:`Pager`; the deadline is also enforced on each awaited call"""
+
+    def __init__(
+        self,
+        fn: Callable[..., Awaitable[GrpcResponse]],
+        request: GrpcRequest,
+        *args: Any,
+        page_retry: Optional[RetryPolicy] = None,
+        page_deadline: Optional[float] = None,
+        page_timeout_arg: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.fn = fn
+        self.args = args
+        self._state = _PagerState(request, kwargs, page_retry, page_deadline, page_timeout_arg)
+
+    @property
+    def resume_token(self) -> Optional[str]:
+        return None if self._state.done else self._state.request.page_token
+
+    @property
+    def pages(self) -> int:
+        return self._state.pages
+
+    def __aiter__(self) -> AsyncPager[GrpcRequest, GrpcResponse]:
+        return self
+
+    async def __anext__(self) -> GrpcResponse:
+        state = self._state
+        if state.done:
+            raise StopAsyncIteration
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                kwargs = state.call_kwargs()
+                response = await asyncio.wait_for(self.fn(state.request, *self.args, **kwargs), state.remaining())
+            except asyncio.TimeoutError as e:
+                # wait_for's own timeout; on 3.11+ this is the builtin TimeoutError anyway
+                await asyncio.sleep(state.delay(TimeoutError(*e.args), attempt))
+            except Exception as e:
+                await asyncio.sleep(state.delay(e, attempt))
+            else:
+                return state.advance(response)
+
+
+def async_pager(
     fn: Callable[Concatenate[GrpcRequest, P], Awaitable[GrpcResponse]],
     request: GrpcRequest,
     *args: P.args,
     **kwargs: P.kwargs,
-) -> AsyncIterator[GrpcResponse]:
-    completed = False
-    while not completed:
-        response = await fn(request, *args, **kwargs)
-        request.page_token = response.next_page_token
-        completed = not response.next_page_token
-        yield response
+) -> AsyncPager[GrpcRequest, GrpcResponse]:
+    return AsyncPager(fn, request, *args, **kwargs)
 
 
 def pager(
     fn: Callable[Concatenate[GrpcRequest, P], GrpcResponse], request: GrpcRequest, *args: P.args, **kwargs: P.kwargs,
+) -> Pager[GrpcRequest, GrpcResponse]:
+    return Pager(fn, request, *args, **kwargs)
+
+
+def prefetched(pages: Iterable[GrpcResponse], depth: int = 2) -> Iter[GrpcResponse]:
+    """
+    Fetches pages on a background thread while the caller works through the current one. Since each
+    request needs the previous page's token, this overlaps the round trips with the caller rather
+    than with each other; at most ``depth`` fetched pages wait in the buffer, so a slow caller
+    holds the fetching back.
+    """
+    return prefetch(pages, depth)
+
+
+def async_prefetched(pages: AsyncIterable[GrpcResponse], depth: int = 2) -> AsyncIter[GrpcResponse]:
+    """The asyncio counterpart of :func:`prefetched`, fetching in a separate task"""
+    return AsyncIter(pages).prefetch(depth)
+
+
+def page_items(pages: Iterable[GrpcResponse], field: PageField[GrpcResponse, T]) -> Iter[T]:
+    """Flattens pages into their items, taken from the repeated ``field`` (a name or a getter)"""
+    getter = operator.attrgetter(field) if isinstance(field, str) else field
+    return Iter(pages).map(getter).flatten()
+
+
+def async_page_items(pages: AsyncIterable[GrpcResponse], field: PageField[GrpcResponse, T]) -> AsyncIter[T]:
+    getter = operator.attrgetter(field) if isinstance(field, str) else field
+    return AsyncIter(pages).map(getter).flatten()
+
+
+@dataclass
+class ChainStats:
+    """Progress of one page chain of a fan-out pager, as passed to its ``on_page`` hook"""
+
+    index: int
+    pages: int = 0
+    retries: int = 0
+    rpc_seconds: float = 0.0
+    started: Optional[float] = None
+
+    @property
+    def pages_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+
+class _Chain(Generic[GrpcRequest, GrpcResponse]):
+    __slots__ = ("request", "stats", "buffer", "done", "in_flight", "attempt_started", "failures", "not_before")
+
+    def __init__(self, index: int, request: GrpcRequest) -> None:
+        self.request = request
+        self.stats = ChainStats(index)
+        self.buffer: Deque[GrpcResponse] = deque()
+        self.done = False
+        self.in_flight = False
+        self.attempt_started = 0.0
+        self.failures = 0  # consecutive failed attempts at the current page
+        self.not_before = 0.0  # when a retry is next allowed
+
+
+class _Fanout(Generic[GrpcRequest, GrpcResponse]):
+    """Scheduling shared by the sync and async fan-out pagers: which chain to call next, and what to yield"""
+
+    def __init__(
+        self,
+        requests: Iterable[GrpcRequest],
+        concurrency: int,
+        depth: int,
+        ordered: bool,
+        retry: Optional[RetryPolicy],
+        on_page: Optional[Callable[[ChainStats, GrpcResponse], Any]],
+    ) -> None:
+        if concurrency < 1 or depth < 1:
+            raise ValueError("concurrency and depth must be positive")
+        self.chains = [_Chain(i, request) for i, request in enumerate(requests)]
+        self.concurrency = concurrency
+        self.depth = depth
+        self.ordered = ordered
+        self.retry = retry
+        self.on_page = on_page
+        self.in_flight = 0
+        self.current = 0  # the chain being yielded when ordered
+        self.cursor = 0  # where the next round of scheduling starts when unordered, so every chain gets a turn
+        self.arrivals: Deque[_Chain[GrpcRequest, GrpcResponse]] = deque()  # chains with a new page, unordered
+
+    def schedule(self) -> List[_Chain[GrpcRequest, GrpcResponse]]:
+        """Chains to call now: not finished, not already waiting on a call and with room in their buffer"""
+        if self.ordered:
+            candidates = self.chains[self.current :]
+        else:
+            candidates = self.chains[self.cursor :] + self.chains[: self.cursor]
+
+        ready = []
+        now = time.monotonic()
+        for chain in candidates:
+            if self.in_flight >= self.concurrency:
+                break
+            if not chain.done and not chain.in_flight and len(chain.buffer) < self.depth and chain.not_before <= now:
+                chain.in_flight = True
+                chain.attempt_started = time.monotonic()
+                if chain.stats.started is None:
+                    chain.stats.started = chain.attempt_started
+                self.in_flight += 1
+                ready.append(chain)
+                self.cursor = (chain.stats.index + 1) % len(self.chains)
+        return ready
+
+    def completed(self, chain: _Chain[GrpcRequest, GrpcResponse], response: GrpcResponse) -> None:
+        self._landed(chain)
+        chain.failures = 0
+        chain.request.page_token = response.next_page_token
+        chain.done = not response.next_page_token
+        chain.buffer.append(response)
+        self.arrivals.append(chain)
+        chain.stats.pages += 1
+        if self.on_page is not None:
+            self.on_page(chain.stats, response)
+
+    def failed(self, chain: _Chain[GrpcRequest, GrpcResponse], error: BaseException) -> None:
+        """Lets the chain be scheduled again if ``error`` may be retried, otherwise raises it"""
+        self._landed(chain)
+        chain.failures += 1
+        if self.retry is None or not self.retry.should_retry(error, chain.failures):
+            raise error
+        chain.not_before = time.monotonic() + self.retry.backoff(chain.failures)
+        chain.stats.retries += 1
+
+    def next_retry(self) -> Optional[float]:
+        """Seconds until the earliest chain waiting to retry may be called again"""
+        waiting = [chain.not_before for chain in self.chains if not chain.done and not chain.in_flight]
+        due = min((t for t in waiting if t > time.monotonic()), default=None)
+        return None if due is None else max(0.0, due - time.monotonic())
+
+    def pop(self) -> Optional[GrpcResponse]:
+        if not self.ordered:
+            return self.arrivals.popleft().buffer.popleft() if self.arrivals else None
+
+        while self.current < len(self.chains):
+            chain = self.chains[self.current]
+            if chain.buffer:
+                return chain.buffer.popleft()
+            if not chain.done:
+                return None
+            self.current += 1
+        return None
+
+    @property
+    def finished(self) -> bool:
+        return all(chain.done and not chain.buffer for chain in self.chains)
+
+    def _landed(self, chain: _Chain[GrpcRequest, GrpcResponse]) -> None:
+        chain.in_flight = False
+        self.in_flight -= 1
+        chain.stats.rpc_seconds += time.monotonic() - chain.attempt_started
+
+
+def fanout_pager(
+    fn: Callable[[GrpcRequest], GrpcResponse],
+    requests: Iterable[GrpcRequest],
+    *,
+    concurrency: int = 8,
+    depth: int = 2,
+    ordered: bool = False,
+    retry: Optional[RetryPolicy] = None,
+    on_page: Optional[Callable[[ChainStats, GrpcResponse], Any]] = None,
 ) -> Iterator[GrpcResponse]:
-    completed = False
-    while not completed:
-        response = fn(request, *args, **kwargs)
-        request.page_token = response.next_page_token
-        completed = not response.next_page_token
-        yield response
+    """
+    Walks one page chain per request template at once (e.g. one per partition), with at most
+    ``concurrency`` calls in flight across all chains, on a thread pool. Pages are yielded as they
+    arrive or, with ``ordered``, chain by chain in the order of ``requests``. A chain stops fetching
+    once ``depth`` of its pages are waiting to be yielded. Failed calls are retried according to
+    ``retry``, after a backoff during which the other chains carry on; ``on_page`` sees every page with its chain's
+    :class:`ChainStats`. Like :func:`pager`, the templates' ``page_token`` is advanced in place.
+    """
+    # built here rather than in the generator so that bad arguments are rejected by the call itself
+    return _fanout_pager(fn, _Fanout(requests, concurrency, depth, ordered, retry, on_page))
+
+
+def _fanout_pager(
+    fn: Callable[[GrpcRequest], GrpcResponse], state: _Fanout[GrpcRequest, GrpcResponse]
+) -> Iterator[GrpcResponse]:
+    pool = ThreadPoolExecutor(max_workers=state.concurrency)
+    calls: Dict[Future[GrpcResponse], _Chain[GrpcRequest, GrpcResponse]] = {}
+    try:
+        while True:
+            for chain in state.schedule():
+                calls[pool.submit(fn, chain.request)] = chain
+
+            response = state.pop()
+            if response is not None:
+                yield response
+                continue
+            if state.finished:
+                return
+
+            if not calls:
+                time.sleep(state.next_retry() or 0)
+                continue
+            done, _ = wait(calls, timeout=state.next_retry(), return_when=FIRST_COMPLETED)
+            for call in done:
+                chain = calls.pop(call)
+                error = call.exception()
+                if error is None:
+                    state.completed(chain, call.result())
+                else:
+                    state.failed(chain, error)
+    finally:
+        for call in calls:
+            call.cancel()
+        pool.shutdown(wait=False)
+
+
+def async_fanout_pager(
+    fn: Callable[[GrpcRequest], Awaitable[GrpcResponse]],
+    requests: Iterable[GrpcRequest],
+    *,
+    concurrency: int = 8,
+    depth: int = 2,
+    ordered: bool = False,
+    retry: Optional[RetryPolicy] = None,
+    on_page: Optional[Callable[[ChainStats, GrpcResponse], Any]] = None,
+) -> AsyncIterator[GrpcResponse]:
+    """The asyncio counterpart of :func:`fanout_pager`, with each call in its own task"""
+    return _async_fanout_pager(fn, _Fanout(requests, concurrency, depth, ordered, retry, on_page))
+
+
+async def _async_fanout_pager(
+    fn: Callable[[GrpcRequest], Awaitable[GrpcResponse]], state: _Fanout[GrpcRequest, GrpcResponse]
+) -> AsyncIterator[GrpcResponse]:
+    calls: Dict[asyncio.Future[GrpcResponse], _Chain[GrpcRequest, GrpcResponse]] = {}
+    try:
+        while True:
+            for chain in state.schedule():
+                calls[asyncio.ensure_future(fn(chain.request))] = chain
+
+            response = state.pop()
+            if response is not None:
+                yield response
+                continue
+            if state.finished:
+                return
+
+            if not calls:
+                await asyncio.sleep(state.next_retry() or 0)
+                continue
+            done, _ = await asyncio.wait(calls, timeout=state.next_retry(), return_when=asyncio.FIRST_COMPLETED)
+            for call in done:
+                chain = calls.pop(call)
+                error = call.exception()
+                if error is None:
+                    state.completed(chain, call.result())
+                else:
+                    state.failed(chain, error)
+    finally:
+        for call in calls:
+            call.cancel()
@@ -1,33 +1,317 @@
 import hashlib
-import json
-from pathlib import Path
-from typing import Any, Optional, Union
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from uuid import UUID
 
+from pydantic import BaseModel
 
-def stable_hash(*args: Union[str, bytes, int]) -> str:
+CHUNK_SIZE = 1 << 20
+
+
+_FRAME = struct.Struct("<cQ")
+_BYTES_TAG = b"b"
+_INT_TAG = b"i"
+
+
+def _int_to_bytes(n: int) -> bytes:
+    return n.to_bytes(n.bit_length() // 8 + 1, "little", signed=True)
+
+
+def stable_hash(*args: Union[str, bytes, bytearray, memoryview, int]) -> str:
+    """
+    Hashes ``args`` into a stable hex digest. Every argument is framed with a type tag and its
+    length, so ``("ab", "c")`` and ``("a", "bc")`` differ; strings hash like their UTF-8 bytes, ints
+    use a compact two's-complement encoding, and buffers are hashed without copying.
+    """
     h = hashlib.md5()
     for a in args:
         if isinstance(a, str):
-            a = a.encode()
+            data: Union[bytes, bytearray, memoryview] = a.encode()
+            tag = _BYTES_TAG
         elif isinstance(a, int):
-            a = bytes(a)
-        h.update(a)
+            data, tag = _int_to_bytes(a), _INT_TAG
+        else:
+            data, tag = a, _BYTES_TAG
+
+        h.update(_FRAME.pack(tag, data.nbytes if isinstance(data, memoryview) else len(data)))
+        h.update(data)
+    return h.hexdigest()
+
+
+def get_hasher(algorithm: str = "md5") -> Any:
+    """
+    Returns a new hash object for ``algorithm``, which may be anything ``hashlib.new`` accepts, the
+    name of an ``xxhash`` constructor (e.g. ``"xxh3_64"``, requires ``xxhash``), or ``"fast"`` for
+    ``xxh3_64`` when ``xxhash`` is installed and ``blake2b`` otherwise.
+    """
+    if algorithm == "fast":
+        try:
+            import xxhash
+        except ImportError:
+            return hashlib.blake2b()
+        return xxhash.xxh3_64()
+
+    if algorithm.startswith("xxh"):
+        import xxhash
+
+        try:
+            return getattr(xxhash, algorithm)()
+        except AttributeError:
+            raise ValueError(f"unsupported hash type {algorithm}") from None
+
+    return hashlib.new(algorithm)
+
+
+def file_hash(path: Union[str, "os.PathLike[str]"], algorithm: str = "md5", chunk_size: int = CHUNK_SIZE) -> str:
+    h = get_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            h.update(view[:n])
     return h.hexdigest()
 
 
-def file_hash(path: str) -> str:
-    contents = Path(path).read_bytes()
-    return stable_hash(contents)
+def file_hashes(
+    paths: Iterable[Union[str, "os.PathLike[str]"]],
+    algorithm: str = "md5",
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> Dict[Union[str, "os.PathLike[str]"], str]:
+    """Hashes many files on a thread pool; hashlib releases the GIL while digesting large chunks"""
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        digests = pool.map(lambda p: file_hash(p, algorithm, chunk_size), paths)
+        return dict(zip(paths, digests))
 
 
 def to_qualified_name(obj: Any) -> str:
     return obj.__module__ + "." + obj.__qualname__
 
 
+_FLOAT = struct.Struct("<d")
+_Writer = Callable[["_Encoder", Any, List[bytes]], None]
+
+# the top-level output is joined into the hash object once this many parts are pending, so memory stays
+# flat however large the value is; strings and buffers at least _SPILL_BYTES long go to it without a copy
+_SPILL_PARTS = 1 << 12
+_SPILL_BYTES = 1 << 16
+
+
+def _frame(tag: bytes, data: bytes) -> bytes:
+    return _FRAME.pack(tag, len(data)) + data
+
+
+def _write_str(enc: "_Encoder", obj: str, out: List[bytes]) -> None:
+    data = obj.encode()
+    out.append(_FRAME.pack(b"s", len(data)))
+    enc.put(data, out)
+
+
+def _write_int(enc: "_Encoder", obj: int, out: List[bytes]) -> None:
+    data = _int_to_bytes(obj)
+    out.append(_FRAME.pack(b"i", len(data)))
+    out.append(data)
+
+
+def _write_float(enc: "_Encoder", obj: float, out: List[bytes]) -> None:
+    out.append(b"f" + _FLOAT.pack(obj))
+
+
+def _write_bool(enc: "_Encoder", obj: bool, out: List[bytes]) -> None:
+    out.append(b"T" if obj else b"F")
+
+
+def _write_none(enc: "_Encoder", obj: None, out: List[bytes]) -> None:
+    out.append(b"N")
+
+
+def _write_buffer(enc: "_Encoder", obj: Union[bytes, bytearray, memoryview], out: List[bytes]) -> None:
+    out.append(_FRAME.pack(b"b", obj.nbytes if isinstance(obj, memoryview) else len(obj)))
+    enc.put(obj, out)  # type: ignore
+
+
+def _write_items(enc: "_Encoder", tag: bytes, obj: Union[List[Any], Tuple[Any, ...]], out: List[bytes]) -> None:
+    out.append(_FRAME.pack(tag, len(obj)))
+    write, stream = enc.write, enc.stream
+    for item in obj:
+        write(item, out)
+        if out is stream and len(out) >= _SPILL_PARTS:
+            enc.flush()
+
+
+def _write_list(enc: "_Encoder", obj: List[Any], out: List[bytes]) -> None:
+    _write_items(enc, b"l", obj, out)
+
+
+def _write_tuple(enc: "_Encoder", obj: Tuple[Any, ...], out: List[bytes]) -> None:
+    if hasattr(obj, "_fields"):
+        enc.write_fields(b"n", obj, obj._fields, out)  # type: ignore
+    else:
+        _write_items(enc, b"t", obj, out)
+
+
+def _write_set(enc: "_Encoder", obj: AbstractSet[Any], out: List[bytes]) -> None:
+    # the order of the members is set by their encodings, so (unlike other containers) they're built up front
+    out.append(_FRAME.pack(b"S", len(obj)))
+    out.extend(sorted(enc.encode(item) for item in obj))
+
+
+def _write_mapping(enc: "_Encoder", obj: Mapping[Any, Any], out: List[bytes]) -> None:
+    out.append(_FRAME.pack(b"d", len(obj)))
+    encode, write, stream = enc.encode, enc.write, enc.stream
+    for key, value in sorted((encode(k), v) for k, v in obj.items()):
+        out.append(key)
+        write(value, out)
+        if out is stream and len(out) >= _SPILL_PARTS:
+            enc.flush()
+
+
+_WRITERS: Dict[type, _Writer] = {
+    str: _write_str,
+    int: _write_int,
+    float: _write_float,
+    bool: _write_bool,
+    type(None): _write_none,
+    bytes: _write_buffer,
+    bytearray: _write_buffer,
+    memoryview: _write_buffer,
+    list: _write_list,
+    tuple: _write_tuple,
+    set: _write_set,
+    frozenset: _write_set,
+    dict: _write_mapping,
+}
+
+
+class _Encoder:
+    """
+    Walks a value once, feeding a tagged, length-framed canonical encoding of it to ``hasher``. Parts
+    written to ``stream`` are hashed in batches as they pile up; sub-encodings that have to be sorted
+    (set members and mapping keys) are built as bytes with :meth:`encode`.
+    """
+
+    __slots__ = ("default", "hasher", "stream")
+
+    def __init__(self, default: Optional[Callable[[Any], Any]], hasher: Any) -> None:
+        self.default = default
+        self.hasher = hasher
+        self.stream: List[bytes] = []
+
+    def flush(self) -> None:
+        if self.stream:
+            self.hasher.update(b"".join(self.stream))
+            self.stream.clear()
+
+    def put(self, data: Union[bytes, bytearray, memoryview], out: List[bytes]) -> None:
+        if out is self.stream and len(data) >= _SPILL_BYTES:
+            self.flush()
+            self.hasher.update(data)
+        else:
+            out.append(data)  # type: ignore
+
+    def encode(self, obj: Any) -> bytes:
+        typ = type(obj)
+        if typ is str:
+            return _frame(b"s", obj.encode())
+        if typ is int:
+            return _frame(b"i", _int_to_bytes(obj))
+        out: List[bytes] = []
+        self.write(obj, out)
+        return b"".join(out)
+
+    def write(self, obj: Any, out: List[bytes]) -> None:
+        typ = type(obj)
+        # str and int dominate cache keys, so they skip the dispatch table
+        if typ is str:
+            data = obj.encode()
+            out.append(_FRAME.pack(b"s", len(data)))
+            if len(data) < _SPILL_BYTES:
+                out.append(data)
+            else:
+                self.put(data, out)
+            return
+        if typ is int:
+            data = obj.to_bytes(obj.bit_length() // 8 + 1, "little", signed=True)
+            out += (_FRAME.pack(b"i", len(data)), data)
+            return
+
+        writer = _WRITERS.get(typ)
+        if writer is not None:
+            writer(self, obj, out)
+        elif isinstance(obj, tuple):
+            _write_tuple(self, obj, out)
+        elif isinstance(obj, Mapping):
+            _write_mapping(self, obj, out)
+        elif isinstance(obj, (set, frozenset)):
+            _write_set(self, obj, out)
+        elif isinstance(obj, list):
+            _write_list(self, obj, out)
+        elif is_dataclass(obj) and not isinstance(obj, type):
+            self.write_fields(b"D", obj, (f.name for f in fields(obj)), out)
+        elif isinstance(obj, BaseModel):
+            self.write_fields(b"M", obj, obj.__fields__, out)
+        elif isinstance(obj, Enum):
+            self.write_fields(b"E", obj, ("value",), out)
+        elif isinstance(obj, (datetime, date, time)):
+            self.write((type(obj).__name__, obj.isoformat()), out)
+        elif isinstance(obj, timedelta):
+            self.write(("timedelta", obj.days, obj.seconds, obj.microseconds), out)
+        elif isinstance(obj, UUID):
+            self.write(("UUID", obj.bytes), out)
+        elif isinstance(obj, (Decimal, PurePath)):
+            self.write((type(obj).__name__, str(obj)), out)
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            _write_buffer(self, obj, out)
+        elif isinstance(obj, str):
+            _write_str(self, str(obj), out)
+        elif isinstance(obj, int):
+            _write_int(self, int(obj), out)
+        elif isinstance(obj, float):
+            _write_float(self, float(obj), out)
+        elif self.default is not None:
+            out.append(b"X")
+            self.write(self.default(obj), out)
+        else:
+            raise TypeError(f"Object of type {type(obj).__name__} cannot be hashed")
+
+    def write_fields(self, tag: bytes, obj: Any, names: Iterable[str], out: List[bytes]) -> None:
+        out.append(_frame(tag, to_qualified_name(type(obj)).encode()))
+        for name in names:
+            _write_str(self, name, out)
+            self.write(getattr(obj, name), out)
+
+
+def canonical_hash(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Hashes the structure of ``obj`` into a stable hex digest in a single walk, without serializing
+    it to JSON first; the encoding is fed to the hash object as it is produced rather than built up in
+    full. Supports scalars, buffers, containers (mappings and sets are order-independent),
+    dataclasses, pydantic models, named tuples, enums and common value types; anything else is passed
+    through ``default`` if given and otherwise raises :class:`TypeError`.
+    """
+    h = hashlib.md5()
+    enc = _Encoder(default, h)
+    enc.write(obj, enc.stream)
+    enc.flush()
+    return h.hexdigest()
+
+
 def hash_objects(*args, **kwargs) -> Optional[str]:
     try:
-        return stable_hash(json.dumps((args, kwargs), sort_keys=True))
-    except Exception:
+        return canonical_hash((args, kwargs))
+    except TypeError:
         pass
 
     return None
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 import builtins
+import contextlib
+import heapq
 import inspect
 import io
 import itertools
+import math
+import multiprocessing
+import multiprocessing.context
 import operator
-from collections import defaultdict
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from functools import reduce
-from queue import Queue
+from queue import Empty, Full, Queue
 from typing import (
+    IO,
+    TYPE_CHECKING,
     Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
     Callable,
+    ContextManager,
+    Deque,
     Dict,
     Generator,
     Generic,
@@ -25,16 +45,22 @@ from typing import (
     Set,
     Tuple,
     Type,
+    Union,
     overload,
 )
 
 import more_itertools
 from typing_extensions import Unpack
 
+from cbtoolz.aggregates import Aggregator, aggregate
 from cbtoolz.callables import identity
-from cbtoolz.streams import StreamIterable
+from cbtoolz.streams import AsyncStreamIterable, StreamIterable
 
-from cbtoolz.types import T0, T1, T2, T3, Out, T, U
+from cbtoolz.types import T0, T1, T2, T3, UNSET, Out, T, U
+from cbtoolz.typeutils import AnyIterable
+
+if TYPE_CHECKING:
+    from cbtoolz.columnar import ArrayIter
 
 Predicate = Callable[[T], bool]
 
@@ -102,6 +128,745 @@ def flatmap(fn: Callable[[T], Iterable[Out]], itr: Iterable[T]) -> Iter[Out]:
     return Iter(value for item in iter(itr) for value in fn(item))
 
 
+ExecutorKind = Union[Literal["thread", "process"], Executor]
+
+
+def pmap(
+    fn: Callable[[T], T0],
+    it: Iterable[T],
+    *,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    executor: ExecutorKind = "thread",
+    ordered: bool = True,
+) -> Iter[T0]:
+    """
+    Maps ``fn`` over ``it`` on a thread or process pool (or a given ``executor``), keeping at most
+    ``window`` calls in flight (twice the worker count by default) so memory stays flat on unbounded
+    sources. Results come back in input order unless ``ordered`` is false, the first error is raised
+    to the consumer, and closing the iterator early cancels the calls that haven't started.
+    """
+    if not isinstance(executor, Executor) and executor not in ("thread", "process"):
+        raise ValueError(f"unknown executor {executor!r}")
+    if (workers is not None and workers < 1) or (window is not None and window < 1):
+        raise ValueError("workers and window must be positive")
+    return Iter(_pmap(fn, it, workers=workers, window=window, executor=executor, ordered=ordered))
+
+
+def _pmap(
+    fn: Callable[[T], T0],
+    it: Iterable[T],
+    *,
+    workers: Optional[int],
+    window: Optional[int],
+    executor: ExecutorKind,
+    ordered: bool,
+) -> Iterator[T0]:
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    elif executor == "thread":
+        pool, owned = ThreadPoolExecutor(max_workers=workers), True
+    else:
+        pool, owned = ProcessPoolExecutor(max_workers=workers), True
+
+    if window is None:
+        window = 2 * (workers or getattr(pool, "_max_workers", None) or 1)
+
+    source = iter(it)
+    pending: deque[Future[T0]] = deque()
+
+    def submit() -> bool:
+        for item in source:
+            pending.append(pool.submit(fn, item))
+            return True
+        return False
+
+    try:
+        while len(pending) < window and submit():
+            pass
+
+        if ordered:
+            while pending:
+                result = pending.popleft().result()
+                submit()
+                yield result
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit()
+                for future in done:
+                    yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=False)
+
+
+def parallel_shards(
+    it: Iterable[T],
+    n: int,
+    fn: Callable[[Iter[T]], Iterable[T0]],
+    *,
+    batch_size: int = 256,
+    window: int = 2,
+    ordered: bool = True,
+    mp_context: Optional[multiprocessing.context.BaseContext] = None,
+) -> Iter[T0]:
+    """
+    Runs ``fn`` in ``n`` worker processes, each over its own sub-:class:`Iter` (shard) of ``it``. The
+    source is read in this process and dealt out in pickled batches of ``batch_size`` to whichever
+    worker is free, with at most ``window`` batches per worker dispatched but not yet yielded, so
+    memory stays bounded on unbounded sources.
+
+    With ``ordered`` the outputs ``fn`` produces while consuming a batch are yielded in the order the
+    batches were read, so element-wise transforms (map, filter, ...) keep the source order; anything
+    ``fn`` yields after its shard is exhausted (e.g. a per-shard total) comes last. Otherwise outputs
+    are yielded as batches complete. ``fn`` and the elements must be picklable under ``mp_context``.
+    """
+    if n < 1 or batch_size < 1 or window < 1:
+        raise ValueError("n, batch_size and window must be positive")
+    return Iter(_parallel_shards(it, n, fn, batch_size, window, ordered, mp_context or multiprocessing.get_context()))
+
+
+_SHARD_DONE = "done"
+_SHARD_ERROR = "error"
+
+
+def _shard_worker(fn: Callable[[Iter[Any]], Iterable[Any]], inbox: Any, outbox: Any) -> None:
+    """Worker process: feeds ``fn`` from ``inbox`` and reports ``(seq, outputs)`` per batch to ``outbox``"""
+    outputs: List[Any] = []
+    current: Optional[int] = None
+
+    def send(message: Tuple[Any, Any]) -> None:
+        outbox.put(pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def shard() -> Iterator[Any]:
+        nonlocal outputs, current
+        while True:
+            message = inbox.get()
+            if message is None:
+                return
+            current, batch = pickle.loads(message)
+            yield from batch
+            # fn asked for more, so everything it made from this batch is in ``outputs``
+            send((current, outputs))
+            outputs, current = [], None
+
+    try:
+        for output in fn(Iter(shard())):
+            outputs.append(output)
+        # if fn stopped partway through a batch, report it under that batch so the ordered merge can move on
+        send((current, outputs))
+        send((_SHARD_DONE, None))
+    except BaseException as e:
+        try:
+            send((_SHARD_ERROR, e))
+        except Exception:
+            # the exception itself didn't pickle
+            send((_SHARD_ERROR, RuntimeError(traceback.format_exc())))
+
+
+def _parallel_shards(
+    it: Iterable[T],
+    n: int,
+    fn: Callable[[Iter[T]], Iterable[T0]],
+    batch_size: int,
+    window: int,
+    ordered: bool,
+    ctx: multiprocessing.context.BaseContext,
+) -> Iterator[T0]:
+    inbox = ctx.Queue()
+    outbox = ctx.Queue()
+    credits = threading.Semaphore(n * window)
+    stop = threading.Event()
+    source_error: List[BaseException] = []
+
+    def feed() -> None:
+        try:
+            for seq, batch in enumerate(more_itertools.chunked(it, batch_size)):
+                while not credits.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                inbox.put(pickle.dumps((seq, batch), protocol=pickle.HIGHEST_PROTOCOL))
+        except BaseException as e:
+            source_error.append(e)
+        finally:
+            # tell every worker its shard has ended, unless the consumer already tore the queues down
+            with contextlib.suppress(ValueError, OSError):
+                for _ in builtins.range(0 if stop.is_set() else n):
+                    inbox.put(None)
+
+    workers = [ctx.Process(target=_shard_worker, args=(fn, inbox, outbox), daemon=True) for _ in builtins.range(n)]
+    for worker in workers:
+        worker.start()
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    completed: Dict[int, List[T0]] = {}
+    tails: List[T0] = []
+    next_seq = 0
+    running = n
+    try:
+        while running:
+            try:
+                tag, payload = pickle.loads(outbox.get(timeout=0.1))
+            except Empty:
+                if any(w.exitcode not in (None, 0) for w in workers):
+                    raise RuntimeError("A shard worker exited unexpectedly") from None
+                continue
+
+            if tag == _SHARD_ERROR:
+                raise payload
+            if tag == _SHARD_DONE:
+                running -= 1
+                if not running:
+                    # every fn has returned; stop the feeder, which may be waiting on credits that never come back
+                    stop.set()
+            elif tag is None:
+                tails.extend(payload)
+            elif not ordered:
+                credits.release()
+                yield from payload
+            else:
+                completed[tag] = payload
+                while next_seq in completed:
+                    credits.release()
+                    yield from completed.pop(next_seq)
+                    next_seq += 1
+
+        # batches no worker got to before they all stopped leave gaps in the sequence
+        for seq in sorted(completed):
+            yield from completed.pop(seq)
+        yield from tails
+        feeder.join()
+        if source_error:
+            raise source_error[0]
+    finally:
+        stop.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+        for q in (inbox, outbox):
+            q.cancel_join_thread()
+            q.close()
+
+
+class _BackgroundReader(Generic[T]):
+    """Pulls from ``it`` on a daemon thread into a queue of at most ``maxsize`` elements"""
+
+    _ITEM, _END, _ERROR = 0, 1, 2
+
+    def __init__(self, it: Iterable[T], maxsize: int) -> None:
+        self._queue: Queue[Tuple[int, Any]] = Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(iter(it),), daemon=True)
+        self._thread.start()
+
+    def get(self, timeout: Optional[float] = None) -> T:
+        """Returns the next element, raising ``queue.Empty`` on timeout and ``StopIteration`` at the end"""
+        kind, value = self._queue.get(timeout=timeout)
+        if kind == self._END:
+            self._queue.put((kind, value))
+            raise StopIteration
+        if kind == self._ERROR:
+            self._queue.put((self._END, None))
+            raise value
+        return value
+
+    def close(self) -> None:
+        self._stop.set()
+        with contextlib.suppress(Empty):
+            while True:
+                self._queue.get_nowait()
+
+    def _run(self, it: Iterator[T]) -> None:
+        try:
+            for item in it:
+                if not self._put((self._ITEM, item)):
+                    # closed early: generators can only be closed from the thread that runs them
+                    close = getattr(it, "close", None)
+                    if close is not None:
+                        close()
+                    return
+            self._put((self._END, None))
+        except BaseException as e:
+            self._put((self._ERROR, e))
+
+    def _put(self, message: Tuple[int, Any]) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+
+def _check_batch_limits(max_items: Optional[int], max_bytes: Optional[int], max_wait: Optional[float]) -> None:
+    if max_items is None and max_bytes is None and max_wait is None:
+        raise ValueError("batched requires at least one of max_items, max_bytes or max_wait")
+    if (max_items is not None and max_items < 1) or (max_bytes is not None and max_bytes < 1):
+        raise ValueError("max_items and max_bytes must be positive")
+
+
+class _Batch(Generic[T]):
+    __slots__ = ("items", "nbytes", "deadline", "max_items", "max_bytes", "max_wait", "sizeof")
+
+    def __init__(
+        self,
+        max_items: Optional[int],
+        max_bytes: Optional[int],
+        max_wait: Optional[float],
+        sizeof: Callable[[Any], int],
+    ) -> None:
+        self.max_items, self.max_bytes, self.max_wait, self.sizeof = max_items, max_bytes, max_wait, sizeof
+        self.items: List[T] = []
+        self.nbytes = 0
+        self.deadline = math.inf
+
+    def add(self, item: T) -> List[List[T]]:
+        """
+        Adds ``item``, returning the batches to yield now: the current one if ``item`` doesn't fit in it,
+        then the one holding ``item`` if that is full as a result
+        """
+        size = self.sizeof(item) if self.max_bytes is not None else 0
+        flushed = []
+        if self.items and self.max_bytes is not None and self.nbytes + size > self.max_bytes:
+            flushed.append(self.flush())
+
+        if not self.items and self.max_wait is not None:
+            self.deadline = time.monotonic() + self.max_wait
+        self.items.append(item)
+        self.nbytes += size
+
+        if (self.max_items is not None and len(self.items) >= self.max_items) or (
+            self.max_bytes is not None and self.nbytes >= self.max_bytes
+        ):
+            flushed.append(self.flush())
+        return flushed
+
+    def flush(self) -> List[T]:
+        items, self.items, self.nbytes, self.deadline = self.items, [], 0, math.inf
+        return items
+
+    def remaining(self) -> Optional[float]:
+        return None if not self.items else max(0.0, self.deadline - time.monotonic())
+
+
+def batched(
+    it: Iterable[T],
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    max_wait: Optional[float] = None,
+    *,
+    sizeof: Callable[[Any], int] = len,
+) -> Iter[List[T]]:
+    """
+    Groups ``it`` into lists, flushing a batch as soon as it holds ``max_items`` elements, would
+    exceed ``max_bytes`` (as measured by ``sizeof``) or ``max_wait`` seconds have passed since its
+    first element arrived. With ``max_wait`` the source is read on a background thread so that a
+    slow source can't hold back a partial batch.
+    """
+    _check_batch_limits(max_items, max_bytes, max_wait)
+    return Iter(_batched(it, _Batch(max_items, max_bytes, max_wait, sizeof)))
+
+
+def _batched(it: Iterable[T], batch: _Batch[T]) -> Iterator[List[T]]:
+    if batch.max_wait is None:
+        for item in it:
+            for flushed in batch.add(item):
+                yield flushed
+        if batch.items:
+            yield batch.flush()
+        return
+
+    reader = _BackgroundReader(it, maxsize=batch.max_items or 1024)
+    try:
+        while True:
+            try:
+                item = reader.get(timeout=batch.remaining())
+            except Empty:
+                yield batch.flush()
+                continue
+            except StopIteration:
+                break
+
+            for flushed in batch.add(item):
+                yield flushed
+        if batch.items:
+            yield batch.flush()
+    finally:
+        reader.close()
+
+
+def _start_pump(it: AsyncIterator[T], maxsize: int) -> Tuple[asyncio.Queue[Tuple[bool, Any]], asyncio.Task[None]]:
+    """
+    Reads ``it`` ahead in a task, into a queue of ``(True, item)`` messages closed by ``(False, None)``
+    or, if the source failed, ``(False, exception)``
+    """
+    queue: asyncio.Queue[Tuple[bool, Any]] = asyncio.Queue(maxsize=maxsize)
+
+    async def pump() -> None:
+        try:
+            async for item in it:
+                await queue.put((True, item))
+            await queue.put((False, None))
+        except Exception as e:
+            await queue.put((False, e))
+
+    return queue, asyncio.ensure_future(pump())
+
+
+def prefetch(it: Iterable[T], n: int) -> Iter[T]:
+    """
+    Reads up to ``n`` elements of ``it`` ahead on a background thread, so that a producer waiting on
+    I/O overlaps with whatever the consumer does with each element. Errors from the source are raised
+    to the consumer in order; closing the result early stops the thread and closes the source.
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    return Iter(_prefetch(it, n))
+
+
+def _prefetch(it: Iterable[T], n: int) -> Iterator[T]:
+    reader = _BackgroundReader(it, maxsize=n)
+    try:
+        while True:
+            try:
+                item = reader.get()
+            except StopIteration:
+                return
+            yield item
+    finally:
+        reader.close()
+
+
+async def _aprefetch(it: AsyncIterator[T], n: int) -> AsyncIterator[T]:
+    queue, task = _start_pump(it, n)
+    try:
+        while True:
+            more, item = await queue.get()
+            if not more:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        task.cancel()
+
+
+async def _abatched(it: AsyncIterator[T], batch: _Batch[T]) -> AsyncIterator[List[T]]:
+    if batch.max_wait is None:
+        async for item in it:
+            for flushed in batch.add(item):
+                yield flushed
+        if batch.items:
+            yield batch.flush()
+        return
+
+    queue, task = _start_pump(it, batch.max_items or 1024)
+    try:
+        while True:
+            try:
+                more, item = await asyncio.wait_for(queue.get(), timeout=batch.remaining())
+            except asyncio.TimeoutError:
+                yield batch.flush()
+                continue
+
+            if not more:
+                if item is not None:
+                    raise item
+                break
+
+            for flushed in batch.add(item):
+                yield flushed
+        if batch.items:
+            yield batch.flush()
+    finally:
+        task.cancel()
+
+
+TeePolicy = Literal["block", "drop", "spill"]
+
+
+class TeeBuffer(Generic[T]):
+    """
+    The shared buffer behind a bounded :meth:`Iter.tee`. Elements pulled from the source are held
+    until the slowest branch has seen them, but never more than ``maxsize`` at a time; once it is
+    full, the next pull either waits for the slowest branch (``"block"``, only possible with
+    ``thread_safe=True`` since branches have to be drained from different threads), discards the
+    oldest element for every branch that has not read it yet (``"drop"``), or pickles the oldest
+    elements to a temporary file under ``spill_dir`` (``"spill"``).
+    """
+
+    def __init__(
+        self,
+        it: Iterable[T],
+        n: int,
+        maxsize: int,
+        *,
+        policy: TeePolicy = "block",
+        thread_safe: bool = False,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if policy not in ("block", "drop", "spill"):
+            raise ValueError(f"Unknown policy {policy!r}")
+        if policy == "block" and not thread_safe:
+            raise ValueError("The 'block' policy needs thread_safe=True, a single thread would deadlock")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self._source = iter(it)
+        self._buffer: Deque[T] = deque()
+        self._head = 0  # position of the first element in _buffer
+        self._next = 0  # position of the next element to pull from the source
+        self._exhausted = False
+        self._positions: Dict[int, int] = {i: 0 for i in builtins.range(n)}
+        self._dropped = [0] * n
+        self._cond = threading.Condition() if thread_safe else None
+        self._spill_dir = spill_dir
+        self._spill: Optional[IO[bytes]] = None
+        self._spilled: Deque[int] = deque()  # file offsets of the elements before _head
+        self.branches = tuple(TeeBranch(self, i) for i in builtins.range(n))
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def spilled(self) -> int:
+        return len(self._spilled)
+
+    @property
+    def lags(self) -> List[int]:
+        """How many elements each branch is behind the furthest one; closed branches report 0"""
+        with self._locked():
+            return [self._next - self._positions.get(i, self._next) for i in builtins.range(len(self.branches))]
+
+    @property
+    def dropped(self) -> List[int]:
+        return list(self._dropped)
+
+    def get(self, index: int) -> T:
+        with self._locked():
+            position = self._positions.get(index)
+            if position is None:
+                raise StopIteration
+
+            first = self._head - len(self._spilled)
+            if position < first:
+                self._dropped[index] += first - position
+                position = first
+            while position == self._next:
+                self._pull()
+
+            if position < self._head:
+                item = self._read_spilled(position - first)
+            else:
+                item = self._buffer[position - self._head]
+            self._positions[index] = position + 1
+            self._trim()
+            return item
+
+    def close(self, index: int) -> None:
+        with self._locked():
+            self._positions.pop(index, None)
+            self._trim()
+
+    def _pull(self) -> None:
+        """Pulls the next element from the source, making room for it according to the policy"""
+        if self._exhausted:
+            raise StopIteration
+
+        if self.policy == "block" and len(self._buffer) >= self.maxsize:
+            assert self._cond is not None
+            # the caller re-checks its position: another branch may pull for it while we wait
+            self._cond.wait()
+            return
+
+        try:
+            item = next(self._source)
+        except StopIteration:
+            self._exhausted = True
+            self._notify()
+            raise
+
+        if len(self._buffer) >= self.maxsize:
+            oldest = self._buffer.popleft()
+            self._head += 1
+            if self.policy == "spill":
+                self._write_spilled(oldest)
+        self._buffer.append(item)
+        self._next += 1
+        self._notify()
+
+    def _trim(self) -> None:
+        slowest = min(self._positions.values(), default=self._next)
+        spilled = min(slowest - (self._head - len(self._spilled)), len(self._spilled))
+        for _ in builtins.range(max(spilled, 0)):
+            self._spilled.popleft()
+        if self._spill is not None and not self._spilled:
+            self._spill.seek(0)
+            self._spill.truncate()
+
+        trimmed = False
+        while self._buffer and self._head < slowest:
+            self._buffer.popleft()
+            self._head += 1
+            trimmed = True
+        if trimmed:
+            self._notify()
+
+    def _write_spilled(self, item: T) -> None:
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(dir=self._spill_dir)
+        offset = self._spill.seek(0, io.SEEK_END)
+        pickle.dump(item, self._spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled.append(offset)
+
+    def _read_spilled(self, index: int) -> T:
+        assert self._spill is not None
+        self._spill.seek(self._spilled[index])
+        return pickle.load(self._spill)
+
+    def _notify(self) -> None:
+        if self._cond is not None:
+            self._cond.notify_all()
+
+    def _locked(self) -> ContextManager[Any]:
+        return self._cond if self._cond is not None else contextlib.nullcontext()
+
+
+class TeeBranch(Iterator[T]):
+    """One consumer of a :class:`TeeBuffer`; ``close`` it to stop it from holding elements back"""
+
+    def __init__(self, buffer: TeeBuffer[T], index: int) -> None:
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def lag(self) -> int:
+        return self.buffer.lags[self.index]
+
+    @property
+    def dropped(self) -> int:
+        return self.buffer.dropped[self.index]
+
+    def __next__(self) -> T:
+        return self.buffer.get(self.index)
+
+    def __iter__(self) -> TeeBranch[T]:
+        return self
+
+    def close(self) -> None:
+        self.buffer.close(self.index)
+
+
+_RUN_BATCH = 1024
+
+
+def external_sorted(
+    it: Iterable[T],
+    key: Optional[Callable[[T], Any]] = None,
+    *,
+    reverse: bool = False,
+    max_memory: Optional[int] = None,
+    sizeof: Callable[[Any], int] = sys.getsizeof,
+    spill_dir: Optional[str] = None,
+    fan_in: int = 64,
+) -> Iter[T]:
+    """
+    Stable sort that holds roughly ``max_memory`` bytes of elements (as estimated by ``sizeof``) at a
+    time: sorted runs are pickled to temporary files under ``spill_dir`` and lazily k-way merged,
+    at most ``fan_in`` runs at once. Without ``max_memory`` this is :func:`builtins.sorted`.
+    """
+    if max_memory is None:
+        return Iter(builtins.sorted(it, key=key, reverse=reverse))
+    if max_memory < 1 or fan_in < 2:
+        raise ValueError("max_memory must be positive and fan_in at least 2")
+    return Iter(_external_sorted(iter(it), key, reverse, max_memory, sizeof, spill_dir, fan_in))
+
+
+def _external_sorted(
+    it: Iterator[T],
+    key: Optional[Callable[[T], Any]],
+    reverse: bool,
+    max_memory: int,
+    sizeof: Callable[[Any], int],
+    spill_dir: Optional[str],
+    fan_in: int,
+) -> Iterator[T]:
+    runs: List[IO[bytes]] = []
+    try:
+        exhausted = False
+        while not exhausted:
+            run: List[T] = []
+            nbytes = 0
+            for item in it:
+                run.append(item)
+                nbytes += sizeof(item)
+                if nbytes >= max_memory:
+                    break
+            else:
+                exhausted = True
+
+            run.sort(key=key, reverse=reverse)
+            if exhausted and not runs:
+                # everything fit in memory
+                yield from run
+                return
+            if run:
+                runs.append(_write_run(run, spill_dir))
+            del run
+
+            if len(runs) >= fan_in:
+                merged = _write_run(_merge_runs(runs, key, reverse), spill_dir)
+                for f in runs:
+                    f.close()
+                runs = [merged]
+
+        yield from _merge_runs(runs, key, reverse)
+    finally:
+        for f in runs:
+            f.close()
+
+
+def _write_run(items: Iterable[T], spill_dir: Optional[str]) -> IO[bytes]:
+    f = tempfile.TemporaryFile(dir=spill_dir)
+    try:
+        for batch in more_itertools.chunked(items, _RUN_BATCH):
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+        f.close()
+        raise
+    f.seek(0)
+    return f
+
+
+def _read_run(f: IO[bytes]) -> Iterator[T]:
+    with f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _merge_runs(runs: List[IO[bytes]], key: Optional[Callable[[T], Any]], reverse: bool) -> Iterator[T]:
+    # heapq.merge prefers earlier iterables on ties, which keeps the sort stable across runs
+    return heapq.merge(*(_read_run(f) for f in runs), key=key, reverse=reverse)
+
+
 class Iter(Iterator[Out], Generic[Out]):
     it: Iterator[Out]
 
@@ -114,8 +879,9 @@ class Iter(Iterator[Out], Generic[Out]):
     def __next__(self) -> Out:
         return next(self.it)
 
-    def __iter__(self) -> Iter[Out]:
-        return self
+    def __iter__(self) -> Iterator[Out]:
+        # hand out the wrapped iterator so that for-loops and builtins consuming an Iter skip __next__
+        return self.it
 
     def skip(self, n: int) -> Iter[Out]:
         more_itertools.consume(self, n=n)
@@ -128,11 +894,11 @@ class Iter(Iterator[Out], Generic[Out]):
         self.each(q.put)
 
     def each(self, fn: Callable[[Out], Any]) -> None:
-        for v in self:
+        for v in self.it:
             fn(v)
 
     def eachstar(self: Iter[Tuple[Unpack[U]]], fn: Callable[[Unpack[U]], Any]) -> None:
-        for v in self:
+        for v in self.it:
             fn(*v)
 
     def sink(self, g: Generator[None, Out, Any], close_when_done: bool = False) -> None:
@@ -167,61 +933,101 @@ class Iter(Iterator[Out], Generic[Out]):
         ...
 
     def zip(self: Iter[Any], *iterables: Iterable[Any]) -> Iter[Tuple[Any, ...]]:
-        return Iter(tuple(x) for x in zip(self, *iterables))
+        return Iter(zip(self.it, *iterables))
 
     def collect_into(self, seq: MutableSequence[Out]) -> None:
         seq.extend(self)
 
     def to_list(self) -> List[Out]:
-        return list(self)
+        return list(self.it)
 
     def to_tuple(self) -> Tuple[Out, ...]:
-        return tuple(self)
+        return tuple(self.it)
 
     def to_set(self) -> Set[Out]:
-        return set(self)
+        return set(self.it)
 
     def to_dict(self: Iter[Tuple[T0, T1]]) -> Dict[T0, T1]:
-        return dict(self)
+        return dict(self.it)
 
     def enumerate(self) -> Iter[Tuple[int, Out]]:
-        return Iter((k, v) for k, v in enumerate(self.it))
+        return Iter(enumerate(self.it))
 
     def map(self, fn: Callable[[Out], T]) -> Iter[T]:
-        return map(fn, self)
+        return Iter(builtins.map(fn, self.it))
+
+    def pmap(
+        self,
+        fn: Callable[[Out], T],
+        *,
+        workers: Optional[int] = None,
+        window: Optional[int] = None,
+        executor: ExecutorKind = "thread",
+    ) -> Iter[T]:
+        return pmap(fn, self, workers=workers, window=window, executor=executor)
+
+    def pmap_unordered(
+        self,
+        fn: Callable[[Out], T],
+        *,
+        workers: Optional[int] = None,
+        window: Optional[int] = None,
+        executor: ExecutorKind = "thread",
+    ) -> Iter[T]:
+        return pmap(fn, self, workers=workers, window=window, executor=executor, ordered=False)
+
+    def parallel_shards(
+        self,
+        n: int,
+        fn: Callable[[Iter[Out]], Iterable[T0]],
+        *,
+        batch_size: int = 256,
+        window: int = 2,
+        ordered: bool = True,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> Iter[T0]:
+        return parallel_shards(
+            self.it, n, fn, batch_size=batch_size, window=window, ordered=ordered, mp_context=mp_context
+        )
 
     def filter(self, fn: Predicate[T0], transform: Callable[[Out], T0] = identity) -> Iter[T0]:
-        return Iter(x for x in self if fn(transform(x)))
+        if transform is identity:
+            return Iter(builtins.filter(fn, self.it))
+        return Iter(x for x in self.it if fn(transform(x)))
 
     def prepend(self, it: Iterable[T0]) -> Iter[T0 | Out]:
         return concat(it, self)
 
     def starfilter(self: Iter[Tuple[Unpack[U]]], fn: Callable[[Unpack[U]], bool]):
-        return Iter((v for v in self if fn(*v)))
+        return Iter(v for v in self.it if fn(*v))
 
     def reduce(self, func: Callable[[T0, Out], T0], args: T0):
-        return reduce(func, self, *args)
+        return reduce(func, self.it, *args)
+
+    def aggregate(self, **aggregators: Aggregator[Out, Any]) -> Dict[str, Any]:
+        """Computes several :mod:`cbtoolz.aggregates` in one pass, e.g. ``it.aggregate(n=Count(), top=TopK(10))``"""
+        return aggregate(self.it, **aggregators)
 
     def cycle(self) -> Iter[Out]:
-        return Iter(itertools.cycle(self))
+        return Iter(itertools.cycle(self.it))
 
     def accumulate(self, func=None, *, initial=None):
-        return Iter(itertools.accumulate(self, func, initial=initial))
+        return Iter(itertools.accumulate(self.it, func, initial=initial))
 
     def concat(self, *iterables: Iterable[Out]):
-        return Iter(itertools.chain(self, *iterables))
+        return Iter(itertools.chain(self.it, *iterables))
 
     def flatten(self: Iter[Iterable[T]]) -> Iter[T]:
-        return Iter(itertools.chain.from_iterable(self))
+        return Iter(itertools.chain.from_iterable(self.it))
 
     def compress(self, selectors) -> Iter[Out]:
-        return Iter(itertools.compress(self, selectors))
+        return Iter(itertools.compress(self.it, selectors))
 
     def dropwhile(self, pred) -> Iter[Out]:
-        return Iter(itertools.dropwhile(pred, self))
+        return Iter(itertools.dropwhile(pred, self.it))
 
     def filterfalse(self, pred: Callable[[Out], bool]):
-        return Iter(itertools.filterfalse(pred, self))
+        return Iter(itertools.filterfalse(pred, self.it))
 
     def grouped(self, fn: Callable[[Out], T0]) -> defaultdict[T0, List[Out]]:
         groups: defaultdict[T0, List[Out]] = defaultdict(list)
@@ -230,10 +1036,35 @@ class Iter(Iterator[Out], Generic[Out]):
         return groups
 
     def groupby(self, key: Callable[[Out], T0]) -> Iter[Tuple[T0, Iter[Out]]]:
-        return starmap(itertools.groupby(self, key), lambda k, g: (k, Iter(g)))
+        return Iter((k, Iter(g)) for k, g in itertools.groupby(self.it, key))
+
+    def sorted(
+        self,
+        key: Optional[Callable[[Out], Any]] = None,
+        *,
+        reverse: bool = False,
+        max_memory: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        spill_dir: Optional[str] = None,
+    ) -> Iter[Out]:
+        return external_sorted(self.it, key, reverse=reverse, max_memory=max_memory, sizeof=sizeof, spill_dir=spill_dir)
+
+    def external_groupby(
+        self,
+        key: Callable[[Out], T0],
+        *,
+        max_memory: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        spill_dir: Optional[str] = None,
+    ) -> Iter[Tuple[T0, Iter[Out]]]:
+        """
+        Like :meth:`grouped`, but groups every key rather than only adjacent ones by sorting first
+        (see :func:`external_sorted`); each group is streamed, so no group has to fit in memory.
+        """
+        return self.sorted(key, max_memory=max_memory, sizeof=sizeof, spill_dir=spill_dir).groupby(key)
 
     def take(self, n: int) -> Iter[Out]:
-        return Iter(itertools.islice(self, n))
+        return Iter(itertools.islice(self.it, n))
 
     def values(self: Iter[Tuple[Any, T1]]) -> Iter[T1]:
         return self.map(operator.itemgetter(1))
@@ -268,17 +1099,35 @@ class Iter(Iterator[Out], Generic[Out]):
         return Iter((k, v) for o in self for k, v in o.items())
 
     def starmap(self: Iter[Tuple[Unpack[U]]], func: Callable[[Unpack[U]], T]) -> Iter[T]:
-        return Iter(itertools.starmap(func, self))
+        return Iter(itertools.starmap(func, self.it))
 
     def takewhile(self, pred: Callable[[Out], bool]) -> Iter[Out]:
-        return Iter(itertools.takewhile(pred, self))
+        return Iter(itertools.takewhile(pred, self.it))
 
-    def fanout(self, n: int):
-        return Iter(Iter(x) for x in itertools.tee(self, n))
+    def fanout(
+        self,
+        n: int,
+        *,
+        maxsize: Optional[int] = None,
+        policy: TeePolicy = "block",
+        thread_safe: bool = False,
+        spill_dir: Optional[str] = None,
+    ) -> Iter[Iter[Out]]:
+        return Iter(self.tee(n, maxsize=maxsize, policy=policy, thread_safe=thread_safe, spill_dir=spill_dir))
 
     def chunked(self, n: int):
         return Iter(more_itertools.chunked(self, n))
 
+    def batched(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        *,
+        sizeof: Callable[[Any], int] = len,
+    ) -> Iter[List[Out]]:
+        return batched(self, max_items, max_bytes, max_wait, sizeof=sizeof)
+
     def ichunked(self, n: int):
         return Iter(Iter(x) for x in more_itertools.ichunked(self, n))
 
@@ -341,9 +1190,25 @@ class Iter(Iterator[Out], Generic[Out]):
 
         return self.side_effect(writer)
 
+    def columnar(self, block_size: int = 1 << 16, dtype: Any = float) -> ArrayIter:
+        """
+        Switches a numeric pipeline to NumPy blocks of ``block_size`` elements, on which map/filter/
+        accumulate run vectorized (see :mod:`cbtoolz.columnar`, which needs the ``numpy`` extra)
+        """
+        from cbtoolz.columnar import ArrayIter, blocks
+
+        return ArrayIter(blocks(self.it, block_size, dtype))
+
     def as_buffered_reader(self: Iter[bytes], buffer_size: int = io.DEFAULT_BUFFER_SIZE) -> io.BufferedReader:
         return io.BufferedReader(StreamIterable(self), buffer_size=buffer_size)
 
+    def prefetch(self, n: int) -> Iter[Out]:
+        return prefetch(self.it, n)
+
+    def to_async(self, executor: Optional[Executor] = None) -> AsyncIter[Out]:
+        """Returns an :class:`AsyncIter` that pulls elements on ``executor`` so blocking sources don't stall the loop"""
+        return AsyncIter(_from_sync(self, executor))
+
     @overload
     def partition(self, pred: Callable[[Out], bool]) -> Tuple[Iter[Out], Iter[Out]]:
         ...
@@ -402,5 +1267,365 @@ class Iter(Iterator[Out], Generic[Out]):
     def tee(self, n: int) -> Tuple[Iter[Out], ...]:
         ...
 
-    def tee(self, n=2):
-        return tuple(Iter(x) for x in itertools.tee(self, n))
+    @overload
+    def tee(
+        self,
+        n: int = 2,
+        *,
+        maxsize: Optional[int],
+        policy: TeePolicy = "block",
+        thread_safe: bool = False,
+        spill_dir: Optional[str] = None,
+    ) -> Tuple[Iter[Out], ...]:
+        ...
+
+    def tee(self, n=2, *, maxsize=None, policy="block", thread_safe=False, spill_dir=None):
+        """
+        Splits into ``n`` independent iterators. Without ``maxsize`` this is :func:`itertools.tee`, which
+        buffers without limit for a lagging branch; with it the branches share a bounded
+        :class:`TeeBuffer` (reachable, with its lag metrics, as ``branch.it.buffer``).
+        """
+        if maxsize is None:
+            return tuple(Iter(x) for x in itertools.tee(self, n))
+        buffer = TeeBuffer(self, n, maxsize, policy=policy, thread_safe=thread_safe, spill_dir=spill_dir)
+        return tuple(Iter(branch) for branch in buffer.branches)
+
+
+async def _resolve(value: Union[T, Awaitable[T]]) -> T:
+    if inspect.isawaitable(value):
+        return await value
+    return value  # type: ignore
+
+
+async def _from_sync(it: Iterable[T], executor: Optional[Executor]) -> AsyncIterator[T]:
+    loop = asyncio.get_running_loop()
+    source = iter(it)
+    done = object()
+    while True:
+        item = await loop.run_in_executor(executor, next, source, done)
+        if item is done:
+            return
+        yield item
+
+
+async def _from_iterable(it: Iterable[T]) -> AsyncIterator[T]:
+    for item in it:
+        yield item
+
+
+def _to_sync(it: AsyncIterator[T], loop: Optional[asyncio.AbstractEventLoop]) -> Iterator[T]:
+    if loop is not None:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(it.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+
+    own_loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield own_loop.run_until_complete(it.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(it, "aclose", None)
+        if aclose is not None:
+            own_loop.run_until_complete(aclose())
+        own_loop.close()
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+
+async def _amap(
+    fn: Callable[[T], Awaitable[T0]], source: AsyncIterator[T], concurrency: int, ordered: bool
+) -> AsyncIterator[T0]:
+    pending: deque[asyncio.Future[T0]] = deque()
+    exhausted = False
+
+    async def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(pending) < concurrency:
+            try:
+                item = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+            else:
+                pending.append(asyncio.ensure_future(fn(item)))
+
+    try:
+        await fill()
+        while pending:
+            if ordered:
+                result = await pending.popleft()
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = done.pop()
+                pending.remove(task)
+                result = task.result()
+            await fill()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class AsyncIter(AsyncIterator[Out], Generic[Out]):
+    """
+    The asyncio counterpart of :class:`Iter`. Wraps any sync or async iterable; functions passed to
+    its stages may be plain callables or coroutine functions.
+    """
+
+    it: AsyncIterator[Out]
+
+    def __init__(self, it: AnyIterable[Out]) -> None:
+        if isinstance(it, AsyncIter):
+            self.it = it.it
+        elif isinstance(it, AsyncIterable):
+            self.it = it.__aiter__()
+        else:
+            self.it = _from_iterable(it)
+
+    def __anext__(self) -> Awaitable[Out]:
+        return self.it.__anext__()
+
+    def __aiter__(self) -> AsyncIter[Out]:
+        return self
+
+    def map(self, fn: Callable[[Out], Union[T, Awaitable[T]]]) -> AsyncIter[T]:
+        async def _map() -> AsyncIterator[T]:
+            async for item in self:
+                yield await _resolve(fn(item))
+
+        return AsyncIter(_map())
+
+    def amap(self, fn: Callable[[Out], Awaitable[T]], *, concurrency: int = 1, ordered: bool = True) -> AsyncIter[T]:
+        """Awaits ``fn`` for up to ``concurrency`` elements at a time"""
+        _check_concurrency(concurrency)
+        return AsyncIter(_amap(fn, self.it, concurrency, ordered))
+
+    def map_blocking(
+        self, fn: Callable[[Out], T], *, executor: Optional[Executor] = None, concurrency: int = 1, ordered: bool = True
+    ) -> AsyncIter[T]:
+        """Runs the blocking ``fn`` on ``executor`` (the loop's default one if not given)"""
+        _check_concurrency(concurrency)
+
+        def _run(item: Out) -> Awaitable[T]:
+            return asyncio.get_running_loop().run_in_executor(executor, fn, item)
+
+        return AsyncIter(_amap(_run, self.it, concurrency, ordered))
+
+    def filter(self, fn: Callable[[Out], Union[bool, Awaitable[bool]]]) -> AsyncIter[Out]:
+        async def _filter() -> AsyncIterator[Out]:
+            async for item in self:
+                if await _resolve(fn(item)):
+                    yield item
+
+        return AsyncIter(_filter())
+
+    def filterfalse(self, fn: Callable[[Out], Union[bool, Awaitable[bool]]]) -> AsyncIter[Out]:
+        async def _filterfalse() -> AsyncIterator[Out]:
+            async for item in self:
+                if not await _resolve(fn(item)):
+                    yield item
+
+        return AsyncIter(_filterfalse())
+
+    def flatmap(self, fn: Callable[[Out], AnyIterable[T]]) -> AsyncIter[T]:
+        return self.map(fn).flatten()
+
+    def flatten(self: AsyncIter[AnyIterable[T]]) -> AsyncIter[T]:
+        async def _flatten() -> AsyncIterator[T]:
+            async for inner in self:
+                if isinstance(inner, AsyncIterable):
+                    async for item in inner:
+                        yield item
+                else:
+                    for item in inner:
+                        yield item
+
+        return AsyncIter(_flatten())
+
+    def enumerate(self, start: int = 0) -> AsyncIter[Tuple[int, Out]]:
+        async def _enumerate() -> AsyncIterator[Tuple[int, Out]]:
+            i = start
+            async for item in self:
+                yield i, item
+                i += 1
+
+        return AsyncIter(_enumerate())
+
+    def take(self, n: int) -> AsyncIter[Out]:
+        async def _take() -> AsyncIterator[Out]:
+            if n <= 0:
+                return
+            i = 0
+            async for item in self:
+                yield item
+                i += 1
+                if i >= n:
+                    return
+
+        return AsyncIter(_take())
+
+    def skip(self, n: int) -> AsyncIter[Out]:
+        async def _skip() -> AsyncIterator[Out]:
+            i = 0
+            async for item in self:
+                if i >= n:
+                    yield item
+                i += 1
+
+        return AsyncIter(_skip())
+
+    def takewhile(self, pred: Callable[[Out], Union[bool, Awaitable[bool]]]) -> AsyncIter[Out]:
+        async def _takewhile() -> AsyncIterator[Out]:
+            async for item in self:
+                if not await _resolve(pred(item)):
+                    return
+                yield item
+
+        return AsyncIter(_takewhile())
+
+    def dropwhile(self, pred: Callable[[Out], Union[bool, Awaitable[bool]]]) -> AsyncIter[Out]:
+        async def _dropwhile() -> AsyncIterator[Out]:
+            dropping = True
+            async for item in self:
+                if dropping and await _resolve(pred(item)):
+                    continue
+                dropping = False
+                yield item
+
+        return AsyncIter(_dropwhile())
+
+    def chunked(self, n: int) -> AsyncIter[List[Out]]:
+        async def _chunked() -> AsyncIterator[List[Out]]:
+            chunk: List[Out] = []
+            async for item in self:
+                chunk.append(item)
+                if len(chunk) >= n:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        return AsyncIter(_chunked())
+
+    def batched(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        *,
+        sizeof: Callable[[Any], int] = len,
+    ) -> AsyncIter[List[Out]]:
+        """See :func:`batched`; with ``max_wait`` the source is read by a separate task"""
+        _check_batch_limits(max_items, max_bytes, max_wait)
+        return AsyncIter(_abatched(self.it, _Batch(max_items, max_bytes, max_wait, sizeof)))
+
+    def prefetch(self, n: int) -> AsyncIter[Out]:
+        """Reads up to ``n`` elements ahead in a separate task; see :func:`prefetch`"""
+        if n < 1:
+            raise ValueError("n must be positive")
+        return AsyncIter(_aprefetch(self.it, n))
+
+    def groupby(self, key: Callable[[Out], T0]) -> AsyncIter[Tuple[T0, List[Out]]]:
+        """Groups runs of adjacent elements with equal keys, like :meth:`Iter.groupby`, into lists"""
+
+        async def _groupby() -> AsyncIterator[Tuple[T0, List[Out]]]:
+            group: List[Out] = []
+            current: Any = None
+            async for item in self:
+                k = key(item)
+                if group and k != current:
+                    yield current, group
+                    group = []
+                current = k
+                group.append(item)
+            if group:
+                yield current, group
+
+        return AsyncIter(_groupby())
+
+    def pairwise(self) -> AsyncIter[Tuple[Out, Out]]:
+        async def _pairwise() -> AsyncIterator[Tuple[Out, Out]]:
+            missing = previous = object()
+            async for item in self:
+                if previous is not missing:
+                    yield previous, item  # type: ignore
+                previous = item
+
+        return AsyncIter(_pairwise())
+
+    def accumulate(self, func: Callable[[Any, Out], Any] = operator.add, *, initial: Any = None) -> AsyncIter[Any]:
+        async def _accumulate() -> AsyncIterator[Any]:
+            total = initial
+            started = initial is not None
+            if started:
+                yield total
+            async for item in self:
+                total = func(total, item) if started else item
+                started = True
+                yield total
+
+        return AsyncIter(_accumulate())
+
+    def concat(self, *iterables: AnyIterable[Out]) -> AsyncIter[Out]:
+        return AsyncIter(_from_iterable([self, *iterables])).flatten()
+
+    def prepend(self, it: AnyIterable[T0]) -> AsyncIter[Union[T0, Out]]:
+        return AsyncIter(_from_iterable([it, self])).flatten()
+
+    def side_effect(self, fn: Callable[[Out], Any]) -> AsyncIter[Out]:
+        async def _side_effect() -> AsyncIterator[Out]:
+            async for item in self:
+                await _resolve(fn(item))
+                yield item
+
+        return AsyncIter(_side_effect())
+
+    async def each(self, fn: Callable[[Out], Any]) -> None:
+        async for item in self:
+            await _resolve(fn(item))
+
+    async def drain(self) -> None:
+        async for _ in self:
+            pass
+
+    async def first(self, default: Any = UNSET) -> Out:
+        async for item in self:
+            return item
+        if default is UNSET:
+            raise ValueError("first() called on an empty iterable")
+        return default
+
+    async def reduce(self, func: Callable[[T0, Out], T0], initial: T0) -> T0:
+        acc = initial
+        async for item in self:
+            acc = func(acc, item)
+        return acc
+
+    async def to_list(self) -> List[Out]:
+        return [item async for item in self]
+
+    async def to_tuple(self) -> Tuple[Out, ...]:
+        return tuple(await self.to_list())
+
+    async def to_set(self) -> Set[Out]:
+        return {item async for item in self}
+
+    async def to_dict(self: AsyncIter[Tuple[T0, T1]]) -> Dict[T0, T1]:
+        return {k: v async for k, v in self}
+
+    def to_sync(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Iter[Out]:
+        """
+        Returns a blocking :class:`Iter` over this one. Elements are awaited on ``loop`` (which must be
+        running in another thread) or, if not given, on a private event loop in the calling thread.
+        """
+        return Iter(_to_sync(self.it, loop))
+
+    def as_stream_reader(self: AsyncIter[bytes], limit: int = 8 * io.DEFAULT_BUFFER_SIZE) -> AsyncStreamIterable:
+        return AsyncStreamIterable(self, limit=limit)
@@ -1,20 +1,144 @@
+import asyncio
+import contextlib
 import io
-from typing import Iterable, Iterator, Union
+import sys
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Deque, Iterable, Iterator, Optional, Union
 
 
 class StreamIterable(io.RawIOBase):
+    """
+    A raw, readable stream over an iterable of byte chunks. Chunks are kept as ``memoryview``s and
+    copied straight into the caller's buffer, so leftover bytes are never re-copied between reads.
+    """
+
     _source: Iterator[bytes]
-    _current: bytearray
+    _chunks: Deque[memoryview]
 
     def __init__(self, source: Iterable[bytes]) -> None:
         self._source = iter(source)
-        self._current = bytearray()
+        self._chunks = deque()
 
     def readable(self) -> bool:
         return True
 
     def readinto(self, target: Union[bytearray, memoryview]) -> int:
-        requested = len(target)
+        if not isinstance(target, memoryview):
+            target = memoryview(target)
+
+        target = target.cast("B")
+        requested = target.nbytes
+        if requested == 0:
+            return 0
+
+        chunks = self._chunks
+        filled = 0
+        while filled < requested:
+            if not chunks:
+                chunk = next(self._source, None)
+                if chunk is None:
+                    break
+                if not chunk:
+                    continue
+                chunks.append(memoryview(chunk).cast("B"))
+
+            head = chunks[0]
+            size = min(head.nbytes, requested - filled)
+            target[filled : filled + size] = head[:size]
+            filled += size
+            if size == head.nbytes:
+                chunks.popleft()
+            else:
+                chunks[0] = head[size:]
+
+        return filled
+
+
+class AsyncStreamIterable:
+    """
+    An asyncio reader over an async iterable of byte chunks, offering the ``read``/``readexactly``/
+    ``readline``/``readinto`` surface of :class:`asyncio.StreamReader`. A background task reads ahead
+    from the source until ``limit`` bytes are buffered and then waits for the consumer, so a slow
+    reader applies backpressure to the producer. Reads larger than ``limit`` still complete, by
+    letting the buffer grow to the requested size.
+    """
+
+    _source: AsyncIterator[bytes]
+    _chunks: Deque[bytes]
+    _offset: int
+    _buffered: int
+    _wanted: int
+    _eof: bool
+    _exception: Optional[BaseException]
+    _pump: "Optional[asyncio.Task[None]]"
+
+    def __init__(self, source: AsyncIterable[bytes], *, limit: int = 8 * io.DEFAULT_BUFFER_SIZE) -> None:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+
+        self._source = source.__aiter__()
+        self._limit = limit
+        self._chunks = deque()
+        self._offset = 0
+        self._buffered = 0
+        self._wanted = 0
+        self._eof = False
+        self._exception = None
+        self._pump = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def _cond(self) -> asyncio.Condition:
+        # created lazily so that it binds to the loop that reads from the stream
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def at_eof(self) -> bool:
+        return self._eof and not self._buffered
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:
+            return b""
+
+        async with self._cond:
+            if n < 0:
+                await self._wait(lambda: self._eof, wanted=sys.maxsize)
+                return self._take(self._buffered)
+
+            await self._wait(lambda: self._buffered > 0 or self._eof)
+            return self._take(min(n, self._buffered))
+
+    async def readexactly(self, n: int) -> bytes:
+        if n < 0:
+            raise ValueError("readexactly size can not be less than zero")
+
+        async with self._cond:
+            await self._wait(lambda: self._buffered >= n or self._eof, wanted=n)
+            if self._buffered < n:
+                raise asyncio.IncompleteReadError(self._take(self._buffered), n)
+            return self._take(n)
+
+    async def readline(self) -> bytes:
+        return await self.readuntil(b"\n")
+
+    async def readuntil(self, separator: bytes = b"\n") -> bytes:
+        """Reads up to and including ``separator``, or whatever is left once the source is exhausted"""
+        if not separator:
+            raise ValueError("Separator should be at least one-byte string")
+
+        async with self._cond:
+            while True:
+                end = self._find(separator)
+                if end >= 0:
+                    return self._take(end)
+                if self._eof:
+                    return self._take(self._buffered)
+
+                buffered = self._buffered
+                await self._wait(lambda: self._buffered > buffered or self._eof, wanted=buffered + 1)
+
+    async def readinto(self, target: Union[bytearray, memoryview]) -> int:
         if not isinstance(target, memoryview):
             target = memoryview(target)
 
@@ -22,13 +146,120 @@ class StreamIterable(io.RawIOBase):
         if target.nbytes == 0:
             return 0
 
-        while len(self._current) < requested:
-            chunk = next(self._source, b"")
-            if not chunk:
-                break
-            self._current.extend(chunk)
+        async with self._cond:
+            await self._wait(lambda: self._buffered > 0 or self._eof)
+            filled = 0
+            while self._chunks and filled < target.nbytes:
+                head = self._chunks[0]
+                size = min(len(head) - self._offset, target.nbytes - filled)
+                target[filled : filled + size] = memoryview(head)[self._offset : self._offset + size]
+                filled += size
+                self._advance(size)
+            return filled
+
+    async def aclose(self) -> None:
+        if self._pump is not None and not self._pump.done():
+            self._pump.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._pump
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def __aenter__(self) -> "AsyncStreamIterable":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._lines()
+
+    async def _lines(self) -> AsyncIterator[bytes]:
+        while True:
+            line = await self.readline()
+            if not line:
+                return
+            yield line
+
+    async def _wait(self, predicate: Callable[[], bool], wanted: int = 0) -> None:
+        """Waits (with the condition held) until ``predicate`` holds, letting the buffer grow to ``wanted``"""
+        if self._pump is None:
+            self._pump = asyncio.get_running_loop().create_task(self._run_pump())
+
+        if wanted > self._limit:
+            self._wanted = wanted
+            self._cond.notify_all()
+        try:
+            await self._cond.wait_for(lambda: predicate() or self._exception is not None)
+        finally:
+            self._wanted = 0
+
+        if self._exception is not None and self._buffered < max(wanted, 1):
+            raise self._exception
+
+    async def _run_pump(self) -> None:
+        try:
+            while True:
+                async with self._cond:
+                    await self._cond.wait_for(lambda: self._buffered < max(self._limit, self._wanted))
+
+                try:
+                    chunk = await self._source.__anext__()
+                except StopAsyncIteration:
+                    break
+                if not chunk:
+                    continue
+
+                data = chunk if isinstance(chunk, (bytes, bytearray)) else bytes(chunk)
+                async with self._cond:
+                    self._chunks.append(data)
+                    self._buffered += len(data)
+                    self._cond.notify_all()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            self._exception = e
+        finally:
+            self._eof = True
+            async with self._cond:
+                self._cond.notify_all()
+
+    def _find(self, separator: bytes) -> int:
+        """Returns the offset just past the first ``separator`` in the buffer, or -1"""
+        position = 0
+        keep = len(separator) - 1
+        tail = b""
+        for i, chunk in enumerate(self._chunks):
+            start = self._offset if i == 0 else 0
+            if tail:
+                # the separator may straddle this chunk and the bytes buffered before it
+                index = (tail + chunk[start : start + keep]).find(separator)
+                if index >= 0:
+                    return position - len(tail) + index + len(separator)
+            index = chunk.find(separator, start)
+            if index >= 0:
+                return position + index - start + len(separator)
+            position += len(chunk) - start
+            # the last ``keep`` bytes seen so far, which may come from several short chunks
+            if keep:
+                tail = (tail + bytes(chunk[max(start, len(chunk) - keep) :]))[-keep:]
+        return -1
+
+    def _take(self, n: int) -> bytes:
+        parts = []
+        while n:
+            head = self._chunks[0]
+            size = min(len(head) - self._offset, n)
+            parts.append(head[self._offset : self._offset + size])
+            n -= size
+            self._advance(size)
+        return b"".join(parts)
 
-        size = min(len(self._current), requested)
-        target[:size] = self._current[:size]
-        self._current = self._current[size:]
-        return size
+    def _advance(self, n: int) -> None:
+        self._offset += n
+        self._buffered -= n
+        if self._offset == len(self._chunks[0]):
+            self._chunks.popleft()
+            self._offset = 0
+        self._cond.notify_all()
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from cbtoolz.aggregates import Aggregator, Count, Distinct, Max, Mean, Min, Quantiles, Sum, TopK, aggregate
+from cbtoolz.iterutils import Iter
+
+
+def test_exact_aggregates_in_one_pass():
+    result = Iter(range(1, 11)).aggregate(
+        n=Count(), total=Sum(), mean=Mean(), low=Min(), high=Max(key=lambda x: -x), top=TopK(3)
+    )
+    assert result == {"n": 10, "total": 55, "mean": 5.5, "low": 1, "high": 1, "top": [10, 9, 8]}
+
+
+def test_empty_stream():
+    result = aggregate([], n=Count(), low=Min(), mean=Mean(), top=TopK(2), p50=Quantiles().at(0.5))
+    assert result == {"n": 0, "low": None, "mean": None, "top": [], "p50": None}
+
+
+def test_aggregates_consume_a_single_traversal():
+    result = aggregate(iter(["a", "bb", "ccc"]), n=Count(), chars=Sum(key=len))
+    assert result == {"n": 3, "chars": 6}
+
+
+def test_incomplete_aggregators_cannot_be_created():
+    class NoResult(Aggregator):
+        def add(self, value):
+            pass
+
+    with pytest.raises(TypeError):
+        NoResult()
+
+
+class TestTopK:
+    def test_key_and_reverse(self):
+        words = ["pear", "fig", "banana", "kiwi", "apple"]
+        assert TopK(2, key=len).update(words).result() == ["banana", "apple"]
+        assert TopK(2, key=len, reverse=True).update(words).result() == ["fig", "pear"]
+
+    def test_ties_keep_the_earliest(self):
+        assert TopK(2, key=lambda p: p[0]).update([(1, "a"), (1, "b"), (1, "c")]).result() == [(1, "a"), (1, "b")]
+
+
+class TestDistinct:
+    @pytest.mark.parametrize("n", [10, 1000, 200_000])
+    def test_estimate_is_close(self, n):
+        d = Distinct().update(i % n for i in range(2 * n))
+        assert abs(d.result() - n) <= max(1, 0.03 * n)
+
+    def test_precision_bounds(self):
+        with pytest.raises(ValueError):
+            Distinct(precision=2)
+
+
+class TestQuantiles:
+    def test_approximate_quantiles(self):
+        values = list(range(100_000))
+        random.Random(0).shuffle(values)
+        q = Quantiles(k=200, seed=1).update(values)
+        for p, estimate in q.result().items():
+            assert abs(estimate - p * 100_000) < 0.02 * 100_000
+        assert sum(len(c) for c in q._compactors) < 1000
+
+    def test_small_streams_are_exact(self):
+        assert Quantiles(qs=(0, 0.5, 1)).update([5, 1, 3]).result() == {0: 1, 0.5: 3, 1: 5}
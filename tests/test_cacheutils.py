@@ -0,0 +1,389 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cbtoolz.cacheutils import AsyncCached, Cached, CacheStore, DiskStore, SingleFlight, acached, cached
+
+
+class TestCacheStore:
+    def test_get_and_set(self):
+        store = CacheStore()
+        store.set("a", 1)
+        assert store.get("a") == 1
+        assert store.get("b", None) is None
+        assert store.stats.hits == 1
+        assert store.stats.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        store = CacheStore(max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.get("a")
+        store.set("c", 3)
+        assert "a" in store
+        assert "b" not in store
+        assert "c" in store
+        assert store.stats.evictions == 1
+
+    def test_evicts_by_size(self):
+        store = CacheStore(max_bytes=10, sizeof=len)
+        store.set("a", b"12345")
+        store.set("b", b"12345")
+        store.set("c", b"1")
+        assert len(store) == 2
+        assert store.nbytes == 6
+        store.set("d", b"x" * 11)
+        assert "d" not in store
+
+    def test_expired_entries_are_misses(self):
+        store = CacheStore()
+        store.set("a", 1, time.monotonic() - 1)
+        assert "a" not in store
+        assert store.get("a", None) is None
+        assert store.stats.expirations == 1
+        assert len(store) == 0
+
+
+class TestCached:
+    def test_cached_value_is_reused(self):
+        calls = []
+
+        def getter():
+            calls.append(1)
+            return "value"
+
+        c = Cached(getter)
+        assert c() == "value"
+        assert c.value == "value"
+        assert len(calls) == 1
+
+    def test_cached_tuple_ttl(self):
+        c = Cached(lambda: ("value", 60))
+        assert c() == "value"
+        assert c.expiration is not None
+        assert 0 < c.ttl <= 60
+
+    def test_cached_aware_expiration(self):
+        c = Cached(lambda: ("value", datetime.now(timezone.utc) + timedelta(hours=1)))
+        assert c() == "value"
+        assert 3590 < c.ttl <= 3600
+        assert abs((c.expiration - datetime.now()).total_seconds() - 3600) < 5
+
+
+class TestCachedDecorator:
+    def test_calls_are_keyed_by_arguments(self):
+        calls = []
+
+        @cached
+        def getter(x, y=0):
+            calls.append((x, y))
+            return x + y
+
+        assert getter(1).value == 1
+        assert getter(1).value == 1
+        assert getter(1, y=2).value == 3
+        assert getter(2).value == 2
+        assert calls == [(1, 0), (1, 2), (2, 0)]
+        assert getter.cache.stats.hits == 1
+        assert getter.cache.stats.misses == 3
+
+    def test_unhashable_arguments(self):
+        calls = []
+
+        @cached
+        def getter(items, opts=None):
+            calls.append(items)
+            return sum(items) + len(opts or {})
+
+        assert getter([1, 2])() == 3
+        assert getter([1, 2])() == 3
+        assert getter((1, 2), opts={"a": 1})() == 4
+        assert getter([1, 3])() == 4
+        assert calls == [[1, 2], (1, 2), [1, 3]]
+
+    def test_max_entries(self):
+        @cached(max_entries=1)
+        def getter(x):
+            return x
+
+        getter(1).value
+        getter(2).value
+        assert len(getter.cache) == 1
+        assert getter.cache.stats.evictions == 1
+
+    def test_functions_sharing_a_store_keep_separate_entries(self):
+        shared = CacheStore()
+
+        @cached(store=shared)
+        def f(x):
+            return f"f{x}"
+
+        @cached(store=shared)
+        def g(x):
+            return f"g{x}"
+
+        assert f(1)() == "f1"
+        assert g(1)() == "g1"
+        assert len(shared) == 2
+
+    def test_ttl_expiry_recomputes(self):
+        calls = []
+
+        @cached
+        def getter():
+            calls.append(1)
+            return "value", datetime.now() - timedelta(seconds=1)
+
+        getter().value
+        getter().value
+        assert len(calls) == 2
+
+
+class TestSingleFlight:
+    def test_concurrent_refresh_runs_once(self):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def getter():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        c = Cached(getter)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(c())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: int("x"))
+        assert "key" not in flight
+
+    def test_serve_stale_refreshes_in_background(self):
+        values = iter(["old", "new"])
+        started = threading.Event()
+        release = threading.Event()
+
+        def getter():
+            value = next(values)
+            if value == "new":
+                started.set()
+                release.wait(1)
+            return value, datetime.now() - timedelta(seconds=1)
+
+        c = Cached(getter, serve_stale=True)
+        assert c() == "old"
+        assert c() == "old"
+        assert started.wait(1)
+        release.set()
+
+    def test_serve_stale_refreshes_once_without_single_flight(self):
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached(single_flight=False, serve_stale=True)
+        def getter():
+            calls.append(1)
+            if len(calls) > 1:
+                started.set()
+                release.wait(1)
+            return "value", datetime.now() - timedelta(seconds=1)
+
+        getter()()
+        threads_before = threading.active_count()
+        assert [getter()() for _ in range(20)] == ["value"] * 20
+        assert threading.active_count() <= threads_before + 1
+        assert started.wait(1)
+        assert len(calls) == 2
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_async_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def getter():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.ado("key", getter) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_to_followers(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def getter():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        leader = asyncio.ensure_future(flight.ado("key", getter))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.ado("key", getter)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await asyncio.gather(*followers) == ["value"] * 3
+        assert leader.cancelled()
+        assert len(calls) == 2
+
+
+class TestAsyncCached:
+    @pytest.mark.asyncio
+    async def test_awaits_getter_once(self):
+        calls = []
+
+        @acached(ttl=60)
+        async def getter(x):
+            calls.append(x)
+            await asyncio.sleep(0)
+            return x * 2
+
+        results = await asyncio.gather(*(getter(2)() for _ in range(5)))
+        assert results == [4] * 5
+        assert await getter(2).value == 4
+        assert calls == [2]
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead(self):
+        values = iter(range(10))
+
+        async def getter():
+            return next(values), 1
+
+        c = AsyncCached(getter, refresh_ahead=0.01)
+        assert await c() == 0
+        await asyncio.sleep(0.05)
+        assert await c() == 0
+        await asyncio.sleep(0)
+        assert await c() == 1
+
+    def test_refresh_ahead_must_be_a_fraction(self):
+        async def getter():
+            return 1
+
+        with pytest.raises(ValueError):
+            AsyncCached(getter, refresh_ahead=1.5)
+
+
+class TestDiskStore:
+    def test_round_trip_across_instances(self, tmp_path):
+        DiskStore(tmp_path).set(("key", 1), {"value": [1, 2, 3]})
+        assert DiskStore(tmp_path).get(("key", 1)) == {"value": [1, 2, 3]}
+
+    def test_namespaces_do_not_collide(self, tmp_path):
+        DiskStore(tmp_path, namespace="a").set("key", 1)
+        assert DiskStore(tmp_path, namespace="b").get("key", None) is None
+
+    def test_expiry(self, tmp_path):
+        store = DiskStore(tmp_path)
+        store.set("fresh", 1, time.monotonic() + 60)
+        store.set("stale", 2, time.monotonic() - 1)
+        assert store.lookup("fresh") == (1, True)
+        assert store.lookup("stale") == (2, False)
+        assert "stale" not in store
+        assert 55 < store.load("fresh")[1] - time.monotonic() <= 60
+
+    def test_culls_to_max_entries(self, tmp_path):
+        store = DiskStore(tmp_path, max_entries=2)
+        for i in range(4):
+            store.set(i, i)
+        assert len(store) == 2
+        assert store.stats.evictions == 2
+
+    def test_cull_drops_expired_entries_first(self, tmp_path):
+        store = DiskStore(tmp_path, max_entries=2)
+        store.set("live", 1, time.monotonic() + 3600)
+        store.set("expired", 2, time.monotonic() - 1)
+        store.set("new", 3, time.monotonic() + 3600)
+        assert "live" in store
+        assert "new" in store
+        assert store.load("expired") is None
+        assert store.stats.expirations == 1
+        assert store.stats.evictions == 0
+
+    def test_expired_files_are_swept(self, tmp_path):
+        store = DiskStore(tmp_path, sweep_interval=None)
+        store.set("a", 1, time.monotonic() - 1)
+        store.set("b", 2, time.monotonic() - 1)
+        store.set("c", 3)
+        assert store.get("a", None) is None
+        assert len(store) == 2
+        store.sweep()
+        assert len(store) == 1
+
+    def test_paths_are_stable_across_processes(self, tmp_path):
+        script = (
+            "from cbtoolz.cacheutils import DiskStore, make_key\n"
+            "key = ('f', make_key(('x', frozenset('abcde')), {'x': 1}))\n"
+            f"print(DiskStore({str(tmp_path)!r}).path(key).name)"
+        )
+        names = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+        assert len(names) == 1
+
+    def test_corrupt_entries_are_misses(self, tmp_path):
+        store = DiskStore(tmp_path)
+        store.path("key").write_bytes(b"garbage")
+        assert store.get("key", None) is None
+
+    def test_functions_sharing_a_directory_keep_separate_entries(self, tmp_path):
+        @cached(store=CacheStore(tier=DiskStore(tmp_path)))
+        def f(x):
+            return f"f{x}"
+
+        @cached(store=CacheStore(tier=DiskStore(tmp_path)))
+        def g(x):
+            return f"g{x}"
+
+        assert f(1)() == "f1"
+        assert g(1)() == "g1"
+        assert len(DiskStore(tmp_path)) == 2
+
+    def test_tiered_store_survives_restart(self, tmp_path):
+        calls = []
+
+        def make_getter():
+            @cached(store=CacheStore(tier=DiskStore(tmp_path)))
+            def getter(x):
+                calls.append(x)
+                return x * 2, 60
+
+            return getter
+
+        assert make_getter()(2).value == 4
+        getter = make_getter()
+        assert getter(2).value == 4
+        assert calls == [2]
+        assert 50 < getter(2).ttl <= 60
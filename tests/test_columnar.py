@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cbtoolz.iterutils import Iter  # noqa: E402
+
+
+def test_map_filter_scalars():
+    result = Iter(range(10)).columnar(block_size=3).map(lambda a: a * 2).filter(lambda a: a > 5).scalars()
+    assert result.to_list() == [6.0, 8.0, 10.0, 12.0, 14.0, 16.0, 18.0]
+
+
+def test_accumulate_carries_across_blocks():
+    data = [3, 1, 4, 1, 5, 9, 2, 6]
+    running_sum = Iter(data).columnar(block_size=3, dtype=int).accumulate().scalars()
+    assert running_sum.to_list() == [3, 4, 8, 9, 14, 23, 25, 31]
+    running_max = Iter(data).columnar(block_size=3, dtype=int).accumulate(np.maximum)
+    assert running_max.to_array().tolist() == [3, 3, 4, 4, 5, 9, 9, 9]
+
+
+def test_arrays_and_rebatch():
+    blocks = Iter(range(10)).columnar(block_size=4).filter(lambda a: a % 2 == 0).rebatch(2).arrays().to_list()
+    assert [b.tolist() for b in blocks] == [[0.0, 2.0], [4.0, 6.0], [8.0]]
+
+
+def test_reductions():
+    assert Iter(range(1, 101)).columnar(block_size=7, dtype=int).sum() == 5050
+    assert Iter([]).columnar().sum() == 0
+    assert Iter([]).columnar().max() is None
+    assert Iter([5, -2, 7]).columnar(block_size=2).min() == -2.0
+    assert Iter(range(10)).columnar(block_size=4).count() == 10
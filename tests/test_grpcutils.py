@@ -0,0 +1,256 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from cbtoolz.grpcutils import (
+    AsyncPager,
+    Pager,
+    RetryPolicy,
+    async_fanout_pager,
+    async_page_items,
+    async_pager,
+    async_prefetched,
+    fanout_pager,
+    page_items,
+    pager,
+    prefetched,
+)
+
+
+@dataclass
+class ListRequest:
+    page_size: int = 2
+    page_token: str = ""
+    partition: int = 0
+
+
+@dataclass
+class ListResponse:
+    items: List[int] = field(default_factory=list)
+    next_page_token: str = ""
+
+
+class FakeService:
+    def __init__(self, total: int, delay: float = 0.0) -> None:
+        self.total = total
+        self.delay = delay
+        self.calls = 0
+
+    def list_page(self, request: ListRequest) -> ListResponse:
+        self.calls += 1
+        start = int(request.page_token or 0)
+        end = min(start + request.page_size, self.total)
+        items = [request.partition * 1000 + i for i in range(start, end)]
+        return ListResponse(items, str(end) if end < self.total else "")
+
+    def list(self, request: ListRequest) -> ListResponse:
+        time.sleep(self.delay)
+        return self.list_page(request)
+
+    async def alist(self, request: ListRequest) -> ListResponse:
+        await asyncio.sleep(self.delay)
+        return self.list_page(request)
+
+
+def test_page_items():
+    service = FakeService(5)
+    assert page_items(pager(service.list, ListRequest()), "items").to_list() == [0, 1, 2, 3, 4]
+    assert service.calls == 3
+
+
+def test_prefetched_overlaps_fetching_with_the_caller():
+    service = FakeService(20, delay=0.01)
+    start = time.perf_counter()
+    for _ in prefetched(pager(service.list, ListRequest()), depth=2):
+        time.sleep(0.01)
+    assert time.perf_counter() - start < 0.18
+
+
+def test_prefetched_depth_bounds_read_ahead():
+    service = FakeService(100)
+    pages = prefetched(pager(service.list, ListRequest()), depth=2)
+    next(pages)
+    time.sleep(0.05)
+    assert service.calls <= 4
+
+
+@pytest.mark.asyncio
+async def test_async_prefetched_items():
+    service = FakeService(7, delay=0.001)
+    pages = async_prefetched(async_pager(service.alist, ListRequest(page_size=3)), depth=2)
+    assert await async_page_items(pages, lambda page: page.items).to_list() == list(range(7))
+
+
+class TestRetries:
+    def flaky(self, service, failures):
+        def call(request, timeout=None):
+            call.timeouts.append(timeout)
+            if failures:
+                raise failures.pop(0)
+            return service.list(request)
+
+        call.timeouts = []
+        return call
+
+    def test_failed_page_is_retried_from_its_token(self):
+        service = FakeService(6)
+        call = self.flaky(service, [ConnectionError(), TimeoutError()])
+        pages = Pager(call, ListRequest(page_token="2"), page_retry=RetryPolicy(initial_backoff=0.001))
+        assert page_items(pages, "items").to_list() == [2, 3, 4, 5]
+        assert pages.pages == 2
+
+    def test_errors_are_raised_without_a_policy_or_once_attempts_run_out(self):
+        service = FakeService(6)
+        with pytest.raises(ConnectionError):
+            list(Pager(self.flaky(service, [ConnectionError()]), ListRequest()))
+
+        call = self.flaky(service, [ConnectionError()] * 3)
+        with pytest.raises(ConnectionError):
+            list(Pager(call, ListRequest(), page_retry=RetryPolicy(attempts=3, initial_backoff=0.001)))
+
+        call = self.flaky(service, [KeyError()])
+        with pytest.raises(KeyError):
+            list(Pager(call, ListRequest(), page_retry=RetryPolicy(initial_backoff=0.001)))
+
+    def test_resume_token(self):
+        service = FakeService(6)
+        pages = Pager(self.flaky(service, []), ListRequest())
+        next(pages)
+        token = pages.resume_token
+        assert token == "2"
+        resumed = Pager(self.flaky(service, []), ListRequest(page_token=token))
+        assert page_items(resumed, "items").to_list() == [2, 3, 4, 5]
+        assert resumed.resume_token is None
+
+    def test_deadline_is_split_across_calls(self):
+        service = FakeService(6)
+        call = self.flaky(service, [])
+        assert len(list(Pager(call, ListRequest(), page_deadline=10, page_timeout_arg="timeout"))) == 3
+        assert all(0 < t <= 10 for t in call.timeouts)
+        assert call.timeouts == sorted(call.timeouts, reverse=True)
+
+        with pytest.raises(TimeoutError):
+            list(Pager(self.flaky(FakeService(6), []), ListRequest(), page_deadline=0))
+
+    def test_rpc_retry_and_timeout_are_passed_through(self):
+        service = FakeService(4)
+        calls = []
+
+        def call(request, retry=None, timeout=None):
+            calls.append((retry, timeout))
+            return service.list(request)
+
+        rpc_retry = object()
+        assert len(list(pager(call, ListRequest(), retry=rpc_retry, timeout=3))) == 2
+        assert calls == [(rpc_retry, 3)] * 2
+
+    def test_retry_policy(self):
+        policy = RetryPolicy(attempts=3, initial_backoff=1, max_backoff=3)
+        assert policy.should_retry(ConnectionError(), 1)
+        assert not policy.should_retry(ConnectionError(), 3)
+        assert not policy.should_retry(ValueError(), 1)
+        assert all(0 <= policy.backoff(attempt) <= 3 for attempt in range(1, 10))
+
+        class FakeRpcError(Exception):
+            def __init__(self, name):
+                self.name = name
+
+            def code(self):
+                return type("StatusCode", (), {"name": self.name})()
+
+        assert policy.should_retry(FakeRpcError("UNAVAILABLE"), 1)
+        assert not policy.should_retry(FakeRpcError("NOT_FOUND"), 1)
+
+    @pytest.mark.asyncio
+    async def test_async_pager_retries_and_enforces_the_deadline(self):
+        service = FakeService(4)
+        failures = [ConnectionError()]
+
+        async def call(request):
+            if failures:
+                raise failures.pop()
+            return await service.alist(request)
+
+        pages = AsyncPager(call, ListRequest(), page_retry=RetryPolicy(initial_backoff=0.001))
+        assert await async_page_items(pages, "items").to_list() == [0, 1, 2, 3]
+
+        async def hang(request):
+            await asyncio.sleep(10)
+
+        with pytest.raises(TimeoutError):
+            await AsyncPager(hang, ListRequest(), page_deadline=0.05).__anext__()
+
+
+def partitions(n):
+    return [ListRequest(page_size=2, partition=i) for i in range(n)]
+
+
+class TestFanoutPager:
+    def test_unordered_respects_concurrency(self):
+        service = FakeService(6, delay=0.005)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def call(request):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                return service.list(request)
+            finally:
+                with lock:
+                    active[0] -= 1
+
+        items = page_items(fanout_pager(call, partitions(5), concurrency=2), "items").to_list()
+        assert sorted(items) == [p * 1000 + i for p in range(5) for i in range(6)]
+        assert peak[0] <= 2
+
+    def test_ordered_yields_chain_by_chain(self):
+        service = FakeService(5, delay=0.001)
+        items = page_items(fanout_pager(service.list, partitions(3), ordered=True), "items").to_list()
+        assert items == [p * 1000 + i for p in range(3) for i in range(5)]
+
+    def test_retries_and_stats(self):
+        service = FakeService(4)
+        failed = set()
+        seen = {}
+
+        def flaky(request):
+            key = (request.partition, request.page_token)
+            if key not in failed:
+                failed.add(key)
+                raise ConnectionError(key)
+            return service.list(request)
+
+        def on_page(stats, response):
+            seen[stats.index] = (stats.pages, stats.retries)
+
+        retry = RetryPolicy(attempts=2, initial_backoff=0.001)
+        pages = list(fanout_pager(flaky, partitions(2), retry=retry, on_page=on_page))
+        assert len(pages) == 4
+        assert seen == {0: (2, 2), 1: (2, 2)}
+
+    def test_errors_that_are_not_retried_propagate(self):
+        def broken(request):
+            raise KeyError(request.partition)
+
+        with pytest.raises(KeyError):
+            list(fanout_pager(broken, partitions(2), retry=RetryPolicy(attempts=4)))
+
+    @pytest.mark.asyncio
+    async def test_async_ordered(self):
+        service = FakeService(5, delay=0.001)
+        pages = async_fanout_pager(service.alist, partitions(3), concurrency=2, ordered=True)
+        items = await async_page_items(pages, "items").to_list()
+        assert items == [p * 1000 + i for p in range(3) for i in range(5)]
+
+    def test_arguments_are_validated_up_front(self):
+        service = FakeService(5)
+        with pytest.raises(ValueError):
+            fanout_pager(service.list, partitions(2), concurrency=0)
+        with pytest.raises(ValueError):
+            async_fanout_pager(service.alist, partitions(2), depth=0)
@@ -1,26 +1,60 @@
 import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import NamedTuple
 
+import pydantic
 import pytest
 
 import cbtoolz
-from cbtoolz.hashutils import file_hash, stable_hash, to_qualified_name
+from cbtoolz import hashutils
+from cbtoolz.hashutils import (
+    canonical_hash,
+    file_hash,
+    file_hashes,
+    get_hasher,
+    hash_objects,
+    stable_hash,
+    to_qualified_name,
+)
 
 
 @pytest.mark.parametrize(
     "inputs,expected",
     [
-        (("hello",), "5d41402abc4b2a76b9719d911017c592"),
-        (("goodbye",), "69faab6268350295550de7d587bc323d"),
-        ((b"goodbye",), "69faab6268350295550de7d587bc323d"),
-        (("hello", "goodbye"), "441add4718519b71e42d329a834d6d5e"),
-        (("hello", b"goodbye"), "441add4718519b71e42d329a834d6d5e"),
-        (("goodbye", "hello"), "c04d8ccb6b9368703e62be93358094f9"),
+        (("hello",), "ad1481a7b27da4dbc1f9f810ea9d5ca6"),
+        (("goodbye",), "b177fa8dfa72d11f77d4c0e3b4952653"),
+        ((b"goodbye",), "b177fa8dfa72d11f77d4c0e3b4952653"),
+        ((bytearray(b"goodbye"),), "b177fa8dfa72d11f77d4c0e3b4952653"),
+        ((memoryview(b"goodbye"),), "b177fa8dfa72d11f77d4c0e3b4952653"),
+        (("hello", "goodbye"), "d7ba977e668bc972edf8e027dfe12e72"),
+        (("hello", b"goodbye"), "d7ba977e668bc972edf8e027dfe12e72"),
+        (("goodbye", "hello"), "c03848a5b7879e8005ff5d22edd3651b"),
     ],
 )
 def test_stable_hash(inputs, expected):
     assert stable_hash(*inputs) == expected
 
 
+@pytest.mark.parametrize(
+    "left,right",
+    [
+        (("ab", "c"), ("a", "bc")),
+        ((1,), (b"\x01",)),
+        ((1,), (-1,)),
+        ((255,), (-1,)),
+        ((0,), ()),
+        ((1_000_000_000,), (1_000_000_001,)),
+    ],
+)
+def test_stable_hash_is_unambiguous(left, right):
+    assert stable_hash(*left) != stable_hash(*right)
+
+
+def test_stable_hash_large_ints():
+    assert stable_hash(1 << 400) == stable_hash(1 << 400)
+
+
 def my_fn():
     pass
 
@@ -60,3 +94,105 @@ class TestFileHash:
         assert val == hashlib.md5(b"0").hexdigest()
         # Check if the hash is stable
         assert val == "cfcd208495d565ef66e7dff9f98764da"
+
+    @pytest.mark.parametrize("algorithm", ["md5", "sha256", "blake2b"])
+    def test_file_hash_algorithms(self, tmp_path, algorithm):
+        contents = bytes(range(256)) * 1000
+        path = tmp_path.joinpath("data.bin")
+        path.write_bytes(contents)
+
+        assert file_hash(path, algorithm, chunk_size=1000) == hashlib.new(algorithm, contents).hexdigest()
+
+    def test_file_hash_fast(self, tmp_path):
+        path = tmp_path.joinpath("data.bin")
+        path.write_bytes(b"0" * 10)
+        h = get_hasher("fast")
+        h.update(b"0" * 10)
+        assert file_hash(path, "fast") == h.hexdigest()
+
+    def test_file_hashes(self, tmp_path):
+        paths = []
+        for i in range(5):
+            path = tmp_path.joinpath(f"{i}.txt")
+            path.write_text(str(i))
+            paths.append(path)
+
+        assert file_hashes(paths) == {p: hashlib.md5(p.read_bytes()).hexdigest() for p in paths}
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class PointModel(pydantic.BaseModel):
+    x: int
+    y: int
+
+
+class PointTuple(NamedTuple):
+    x: int
+    y: int
+
+
+class TestCanonicalHash:
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            {"a": 1, "b": [1, 2.5, None, True]},
+            {1, 2, 3},
+            frozenset({"a", "b"}),
+            b"bytes",
+            datetime(2022, 1, 1, tzinfo=timezone.utc),
+            Point(1, 2),
+            PointModel(x=1, y=2),
+            PointTuple(1, 2),
+        ],
+    )
+    def test_is_stable(self, obj):
+        assert canonical_hash(obj) == canonical_hash(obj)
+        assert hash_objects(obj) is not None
+
+    def test_mappings_and_sets_are_order_independent(self):
+        assert canonical_hash({"a": 1, "b": 2}) == canonical_hash({"b": 2, "a": 1})
+        assert canonical_hash({"x", "y", "z"}) == canonical_hash({"z", "y", "x"})
+
+    @pytest.mark.parametrize(
+        "left,right",
+        [
+            ((1, 2), [1, 2]),
+            (1, 1.0),
+            (1, True),
+            ("1", 1),
+            (("ab", "c"), ("a", "bc")),
+            (Point(1, 2), PointModel(x=1, y=2)),
+            (Point(1, 2), PointTuple(1, 2)),
+            (PointTuple(1, 2), (1, 2)),
+            ({"a": [1]}, {"a": [[1]]}),
+        ],
+    )
+    def test_distinguishes_structures(self, left, right):
+        assert canonical_hash(left) != canonical_hash(right)
+
+    def test_shared_sub_objects(self):
+        shared = (1, 2, 3)
+        assert canonical_hash([shared, shared]) == canonical_hash([(1, 2, 3), (1, 2, 3)])
+
+    def test_large_values_are_streamed_into_the_same_digest(self):
+        big = {
+            "rows": [{"id": i, "name": f"row{i}"} for i in range(5000)],
+            "blob": b"x" * (1 << 17),
+            "text": "y" * (1 << 17),
+        }
+        encoding = hashutils._Encoder(None, None).encode(big)
+        assert canonical_hash(big) == hashlib.md5(encoding).hexdigest()
+
+    def test_unsupported_objects(self):
+        with pytest.raises(TypeError):
+            canonical_hash(object())
+        assert hash_objects(object()) is None
+        assert canonical_hash(object(), default=repr) != canonical_hash(object(), default=repr)
+        assert canonical_hash(object(), default=lambda o: type(o).__name__) == canonical_hash(
+            object(), default=lambda o: type(o).__name__
+        )
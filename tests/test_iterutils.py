@@ -0,0 +1,463 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from cbtoolz import iterutils
+from cbtoolz.iterutils import AsyncIter, Iter
+
+
+def square(x):
+    return x * x
+
+
+class TestParallelMap:
+    def test_pmap_preserves_order(self):
+        def slow_square(x):
+            time.sleep(0.001 * (10 - x))
+            return x * x
+
+        assert iterutils.range(10).pmap(slow_square, workers=4).to_list() == [x * x for x in range(10)]
+
+    def test_pmap_unordered(self):
+        assert sorted(iterutils.range(20).pmap_unordered(square, workers=4)) == [x * x for x in range(20)]
+
+    def test_pmap_chains(self):
+        assert iterutils.range(10).pmap(square).filter(lambda x: x % 2 == 0).take(3).to_list() == [0, 4, 16]
+
+    def test_pmap_process_pool(self):
+        assert iterutils.range(5).pmap(square, workers=2, executor="process").to_list() == [0, 1, 4, 9, 16]
+
+    def test_pmap_bounds_in_flight_work(self):
+        pulled = []
+        gate = threading.Event()
+
+        def source():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        def blocked(x):
+            gate.wait(1)
+            return x
+
+        it = Iter(source()).pmap(blocked, workers=2, window=3)
+        thread = threading.Thread(target=lambda: next(it))
+        thread.start()
+        time.sleep(0.05)
+        assert len(pulled) == 3
+        gate.set()
+        thread.join()
+        it.it.close()
+
+    def test_pmap_validates_arguments_up_front(self):
+        with pytest.raises(ValueError):
+            iterutils.pmap(square, range(3), executor="fiber")
+        with pytest.raises(ValueError):
+            iterutils.range(3).pmap(square, window=0, executor="process")
+        with pytest.raises(ValueError):
+            iterutils.range(3).pmap_unordered(square, workers=0)
+
+    def test_pmap_propagates_errors(self):
+        def fail(x):
+            if x == 3:
+                raise ValueError(x)
+            return x
+
+        with pytest.raises(ValueError):
+            iterutils.range(10).pmap(fail, workers=2).to_list()
+
+    def test_pmap_take_stops_source(self):
+        pulled = []
+
+        def source():
+            for i in range(1000):
+                pulled.append(i)
+                yield i
+
+        assert Iter(source()).pmap(square, workers=2, window=4).take(2).to_list() == [0, 1]
+        assert len(pulled) < 10
+
+
+async def arange(n):
+    for i in range(n):
+        yield i
+        await asyncio.sleep(0)
+
+
+class TestAsyncIter:
+    @pytest.mark.asyncio
+    async def test_fluent_chain(self):
+        async def double(x):
+            return x * 2
+
+        result = await AsyncIter(arange(10)).map(double).filter(lambda x: x % 4 == 0).skip(1).take(2).to_list()
+        assert result == [4, 8]
+
+    @pytest.mark.asyncio
+    async def test_wraps_sync_iterables(self):
+        assert await AsyncIter(range(3)).enumerate(1).to_list() == [(1, 0), (2, 1), (3, 2)]
+
+    @pytest.mark.asyncio
+    async def test_chunked_groupby_flatten(self):
+        assert await AsyncIter(arange(5)).chunked(2).to_list() == [[0, 1], [2, 3], [4]]
+        assert await AsyncIter("aabccc").groupby(lambda c: c).map(lambda g: (g[0], len(g[1]))).to_list() == [
+            ("a", 2),
+            ("b", 1),
+            ("c", 3),
+        ]
+        assert await AsyncIter([[1, 2], arange(2)]).flatten().to_list() == [1, 2, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_amap_bounds_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def work(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001 * (5 - x % 5))
+            running -= 1
+            return x
+
+        assert await AsyncIter(arange(20)).amap(work, concurrency=4).to_list() == list(range(20))
+        assert peak == 4
+        assert sorted(await AsyncIter(arange(20)).amap(work, concurrency=4, ordered=False).to_list()) == list(range(20))
+
+    def test_concurrency_is_validated_up_front(self):
+        with pytest.raises(ValueError):
+            AsyncIter(range(3)).amap(asyncio.sleep, concurrency=0)
+        with pytest.raises(ValueError):
+            AsyncIter(range(3)).map_blocking(square, concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_map_blocking(self):
+        assert await AsyncIter(arange(4)).map_blocking(lambda x: x + 1, concurrency=2).to_list() == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_from_sync_iter(self):
+        assert await iterutils.range(3).to_async().map(lambda x: x * 10).to_list() == [0, 10, 20]
+
+    def test_to_sync(self):
+        assert AsyncIter(arange(3)).to_sync().map(lambda x: x + 1).to_list() == [1, 2, 3]
+
+    def test_to_sync_on_running_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            assert AsyncIter(arange(3)).to_sync(loop).to_list() == [0, 1, 2]
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+def slow_source(delays):
+    for i, delay in enumerate(delays):
+        time.sleep(delay)
+        yield i
+
+
+class TestBatched:
+    def test_max_items(self):
+        assert Iter(range(7)).batched(max_items=3).to_list() == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_max_bytes_flushes_before_overflow(self):
+        chunks = [b"aa", b"bbb", b"c", b"dddddd", b"e"]
+        assert Iter(chunks).batched(max_bytes=5).to_list() == [[b"aa", b"bbb"], [b"c"], [b"dddddd"], [b"e"]]
+
+    def test_oversized_item_is_yielded_without_waiting_for_the_next(self):
+        pulled = []
+
+        def source():
+            for chunk in [b"a", b"x" * 100, b"b"]:
+                pulled.append(chunk)
+                yield chunk
+
+        batches = Iter(source()).batched(max_items=10, max_bytes=10)
+        assert next(batches) == [b"a"]
+        assert next(batches) == [b"x" * 100]
+        assert len(pulled) == 2
+        assert list(batches) == [[b"b"]]
+
+    @pytest.mark.asyncio
+    async def test_async_oversized_item_is_yielded_without_waiting_for_the_next(self):
+        pulled = []
+
+        async def source():
+            for chunk in [b"a", b"x" * 100, b"b"]:
+                pulled.append(chunk)
+                yield chunk
+
+        batches = AsyncIter(source()).batched(max_items=10, max_bytes=10).__aiter__()
+        assert await batches.__anext__() == [b"a"]
+        assert await batches.__anext__() == [b"x" * 100]
+        assert len(pulled) == 2
+
+    def test_first_limit_wins(self):
+        assert Iter(["a"] * 5).batched(max_items=2, max_bytes=10).to_list() == [["a", "a"], ["a", "a"], ["a"]]
+
+    def test_max_wait_flushes_partial_batches(self):
+        batches = iterutils.batched(slow_source([0, 0, 0.2, 0]), max_items=10, max_wait=0.05).to_list()
+        assert batches == [[0, 1], [2, 3]]
+
+    def test_max_wait_propagates_errors(self):
+        def failing():
+            yield 1
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            Iter(failing()).batched(max_wait=1).to_list()
+
+    def test_requires_a_limit(self):
+        with pytest.raises(ValueError):
+            Iter([1]).batched()
+
+    @pytest.mark.asyncio
+    async def test_async_max_wait(self):
+        async def source():
+            for i, delay in enumerate([0, 0, 0.2, 0]):
+                await asyncio.sleep(delay)
+                yield i
+
+        assert await AsyncIter(source()).batched(max_items=10, max_wait=0.05).to_list() == [[0, 1], [2, 3]]
+        assert await AsyncIter(range(5)).batched(max_items=2).to_list() == [[0, 1], [2, 3], [4]]
+
+
+class TestBoundedTee:
+    def test_unbounded_tee_is_unchanged(self):
+        a, b = Iter(range(3)).tee()
+        assert (a.to_list(), b.to_list()) == ([0, 1, 2], [0, 1, 2])
+
+    def test_branches_see_every_element(self):
+        a, b = Iter(range(5)).tee(maxsize=2, policy="spill")
+        assert list(zip(a, b)) == [(i, i) for i in range(5)]
+
+    def test_drop_discards_for_lagging_branch(self):
+        a, b = Iter(range(10)).tee(maxsize=3, policy="drop")
+        assert a.to_list() == list(range(10))
+        assert b.it.lag == 10
+        assert b.to_list() == [7, 8, 9]
+        assert b.it.dropped == 7
+        assert a.it.buffer.buffered == 0
+
+    def test_spill_keeps_memory_bounded(self, tmp_path):
+        a, b = Iter(range(100)).tee(maxsize=4, policy="spill", spill_dir=str(tmp_path))
+        assert a.to_list() == list(range(100))
+        buffer = a.it.buffer
+        assert buffer.buffered == 4
+        assert buffer.spilled == 96
+        assert buffer.lags == [0, 100]
+        assert b.to_list() == list(range(100))
+        assert buffer.spilled == 0
+
+    def test_closed_branch_releases_elements(self):
+        a, b = Iter(range(10)).tee(maxsize=2, policy="drop")
+        b.it.close()
+        assert a.to_list() == list(range(10))
+        assert b.to_list() == []
+        assert b.it.dropped == 0
+
+    def test_block_applies_backpressure_across_threads(self):
+        branches = Iter(range(1000)).fanout(3, maxsize=8, thread_safe=True).to_list()
+        results = [None] * 3
+        buffered = []
+
+        def drain(i):
+            out = []
+            for v in branches[i]:
+                buffered.append(branches[i].it.buffer.buffered)
+                if i == 0:
+                    time.sleep(0.0001)
+                out.append(v)
+            results[i] = out
+
+        threads = [threading.Thread(target=drain, args=(i,)) for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [list(range(1000))] * 3
+        assert max(buffered) <= 8
+
+    def test_block_requires_thread_safe(self):
+        with pytest.raises(ValueError):
+            Iter(range(3)).tee(maxsize=2)
+
+
+class TestChains:
+    def test_stages_share_the_source(self):
+        source = Iter(range(10))
+        evens = source.filter(lambda x: x % 2 == 0)
+        assert next(evens) == 0
+        assert next(source) == 1
+        assert evens.map(square).take(2).to_list() == [4, 16]
+        assert source.to_list() == [5, 6, 7, 8, 9]
+
+    def test_fused_chain(self):
+        result = Iter(range(20)).map(square).filter(lambda x: x % 2).enumerate().takewhile(lambda p: p[0] < 3)
+        assert result.values().to_list() == [1, 9, 25]
+
+    def test_filter_with_transform(self):
+        assert Iter([(1, "a"), (2, "b")]).filter(lambda x: x > 1, transform=lambda p: p[0]).to_list() == [(2, "b")]
+
+
+class TestExternalSort:
+    def test_in_memory(self):
+        assert Iter([3, 1, 2]).sorted(reverse=True).to_list() == [3, 2, 1]
+
+    def test_spills_and_merges_runs(self, tmp_path):
+        data = [(i * 7919) % 1000 for i in range(1000)]
+        result = Iter(data).sorted(max_memory=100, sizeof=lambda _: 1, spill_dir=str(tmp_path)).to_list()
+        assert result == sorted(data)
+
+    def test_multi_pass_merge_is_stable(self):
+        data = [(i % 10, i) for i in range(500)]
+        result = iterutils.external_sorted(data, key=lambda p: p[0], max_memory=7, sizeof=lambda _: 1, fan_in=3)
+        assert result.to_list() == sorted(data, key=lambda p: p[0])
+
+    def test_reverse_with_key(self):
+        data = list(range(50))
+        result = Iter(data).sorted(key=lambda x: x % 5, reverse=True, max_memory=8, sizeof=lambda _: 1)
+        assert result.to_list() == sorted(data, key=lambda x: x % 5, reverse=True)
+
+    def test_external_groupby(self):
+        groups = Iter(["b1", "a1", "b2", "c1", "a2"]).external_groupby(lambda s: s[0], max_memory=2, sizeof=lambda _: 1)
+        assert [(k, g.to_list()) for k, g in groups] == [("a", ["a1", "a2"]), ("b", ["b1", "b2"]), ("c", ["c1"])]
+
+    def test_groupby_adjacent(self):
+        assert [(k, g.to_list()) for k, g in Iter([1, 1, 2, 1]).groupby(lambda x: x)] == [
+            (1, [1, 1]),
+            (2, [2]),
+            (1, [1]),
+        ]
+
+
+class TestPrefetch:
+    def test_overlaps_producer_and_consumer(self):
+        def producer():
+            for i in range(10):
+                time.sleep(0.01)
+                yield i
+
+        start = time.perf_counter()
+        for _ in Iter(producer()).prefetch(4):
+            time.sleep(0.01)
+        assert time.perf_counter() - start < 0.18
+
+    def test_reads_at_most_n_ahead(self):
+        pulled = []
+        it = Iter(range(100)).side_effect(pulled.append).prefetch(3)
+        assert next(it) == 0
+        time.sleep(0.05)
+        assert len(pulled) <= 5
+
+    def test_errors_are_raised_in_order(self):
+        def failing():
+            yield 1
+            yield 2
+            raise KeyError("boom")
+
+        it = Iter(failing()).prefetch(10)
+        assert next(it) == 1
+        assert next(it) == 2
+        with pytest.raises(KeyError):
+            next(it)
+
+    def test_early_close_closes_the_source(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                for i in itertools.count():
+                    yield i
+            finally:
+                closed.set()
+
+        it = Iter(source()).prefetch(2)
+        assert it.take(3).to_list() == [0, 1, 2]
+        it.it.close()
+        assert closed.wait(1)
+
+    @pytest.mark.asyncio
+    async def test_async_prefetch(self):
+        async def source():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+            raise ValueError("done")
+
+        it = AsyncIter(source()).prefetch(2)
+        assert await it.take(5).to_list() == [0, 1, 2, 3, 4]
+        with pytest.raises(ValueError):
+            await it.to_list()
+
+
+def square_all(it):
+    return it.map(square)
+
+
+def odd_squares(it):
+    return it.filter(lambda x: x % 2).map(square)
+
+
+def shard_total(it):
+    yield sum(it)
+
+
+def take3(it):
+    return it.take(3)
+
+
+def fail_on_seven(it):
+    for x in it:
+        if x == 7:
+            raise KeyError(x)
+        yield x
+
+
+class TestParallelShards:
+    def test_ordered_map(self):
+        assert Iter(range(1000)).parallel_shards(4, square_all, batch_size=16).to_list() == [x * x for x in range(1000)]
+
+    def test_ordered_filter(self):
+        expected = [x * x for x in range(1000) if x % 2]
+        assert Iter(range(1000)).parallel_shards(3, odd_squares, batch_size=7).to_list() == expected
+
+    def test_unordered(self):
+        result = iterutils.parallel_shards(range(1000), 4, square_all, batch_size=10, ordered=False).to_list()
+        assert sorted(result) == [x * x for x in range(1000)]
+
+    def test_per_shard_outputs_come_last(self):
+        totals = Iter(range(100)).parallel_shards(3, shard_total, batch_size=10).to_list()
+        assert len(totals) == 3
+        assert sum(totals) == sum(range(100))
+
+    def test_worker_errors_propagate(self):
+        with pytest.raises(KeyError):
+            Iter(range(100)).parallel_shards(2, fail_on_seven, batch_size=4).to_list()
+
+    def test_source_errors_propagate(self):
+        def source():
+            yield from range(10)
+            raise ValueError("source")
+
+        with pytest.raises(ValueError):
+            Iter(source()).parallel_shards(2, square_all, batch_size=3).to_list()
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_fn_stops_reading_early(self, ordered):
+        result = iterutils.parallel_shards(range(100000), 2, take3, batch_size=4, ordered=ordered).to_list()
+        assert sorted(result) == [0, 1, 2, 4, 5, 6]
+        if ordered:
+            assert result == [0, 1, 2, 4, 5, 6]
+
+    def test_early_close(self):
+        result = Iter(itertools.count()).parallel_shards(2, square_all, batch_size=8)
+        assert result.take(5).to_list() == [0, 1, 4, 9, 16]
+        result.it.close()
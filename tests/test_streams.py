@@ -0,0 +1,112 @@
+import asyncio
+import io
+
+import pytest
+
+from cbtoolz.iterutils import Iter
+from cbtoolz.streams import AsyncStreamIterable, StreamIterable
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64, 1024])
+def test_reads_across_chunk_boundaries(read_size):
+    chunks = [b"abc", b"", b"defgh", b"i", bytearray(b"jklmnop"), memoryview(b"qrstuvwxyz")]
+    stream = StreamIterable(chunks)
+    result = bytearray()
+    buffer = bytearray(read_size)
+    while True:
+        n = stream.readinto(buffer)
+        if not n:
+            break
+        result += buffer[:n]
+    assert bytes(result) == b"abcdefghijklmnopqrstuvwxyz"
+
+
+def test_readinto_empty_buffer():
+    assert StreamIterable([b"abc"]).readinto(bytearray()) == 0
+
+
+def test_buffered_reader():
+    reader = Iter(b"line %d\n" % i for i in range(1000)).as_buffered_reader(buffer_size=64)
+    assert reader.readline() == b"line 0\n"
+    assert reader.read(7) == b"line 1\n"
+    assert len(reader.read()) == sum(len(b"line %d\n" % i) for i in range(2, 1000))
+
+
+def test_text_wrapper():
+    reader = io.TextIOWrapper(Iter([b"hello ", b"world"]).as_buffered_reader())
+    assert reader.read() == "hello world"
+
+
+async def agen(chunks, produced=None):
+    for chunk in chunks:
+        if produced is not None:
+            produced.append(chunk)
+        yield chunk
+        await asyncio.sleep(0)
+
+
+class TestAsyncStreamIterable:
+    @pytest.mark.asyncio
+    async def test_read(self):
+        stream = AsyncStreamIterable(agen([b"abc", b"", b"def"]))
+        assert await stream.read(2) == b"ab"
+        assert await stream.read() == b"cdef"
+        assert await stream.read(10) == b""
+        assert stream.at_eof()
+
+    @pytest.mark.asyncio
+    async def test_readexactly(self):
+        stream = AsyncStreamIterable(agen([b"ab", b"cd", b"ef"]), limit=1)
+        assert await stream.readexactly(5) == b"abcde"
+        with pytest.raises(asyncio.IncompleteReadError) as exc:
+            await stream.readexactly(2)
+        assert exc.value.partial == b"f"
+
+    @pytest.mark.asyncio
+    async def test_readline(self):
+        stream = AsyncStreamIterable(agen([b"one\ntw", b"o", b"\nthree\r", b"\nfour"]), limit=2)
+        assert [line async for line in stream] == [b"one\n", b"two\n", b"three\r\n", b"four"]
+
+    @pytest.mark.asyncio
+    async def test_readuntil_straddling_separator(self):
+        stream = AsyncStreamIterable(agen([b"ab\r", b"\ncd\r\n"]))
+        assert await stream.readuntil(b"\r\n") == b"ab\r\n"
+        assert await stream.readuntil(b"\r\n") == b"cd\r\n"
+
+    @pytest.mark.asyncio
+    async def test_readuntil_separator_across_many_chunks(self):
+        stream = AsyncStreamIterable(agen([b"a", b"b", b"c", b"def"]))
+        assert await stream.readuntil(b"abc") == b"abc"
+        assert await stream.readuntil(b"abc") == b"def"
+
+        stream = AsyncStreamIterable(agen([b"xx<", b"-", b"-", b"->yy"]))
+        assert await stream.readuntil(b"<--->") == b"xx<--->"
+
+    @pytest.mark.asyncio
+    async def test_readinto(self):
+        stream = AsyncStreamIterable(agen([b"abc", b"def"]))
+        buffer = bytearray(4)
+        await stream.readexactly(0)
+        n = await stream.readinto(buffer)
+        assert bytes(buffer[:n]) in (b"abc", b"abcd")
+
+    @pytest.mark.asyncio
+    async def test_read_ahead_is_bounded(self):
+        produced = []
+        stream = AsyncStreamIterable(agen([b"x" * 10] * 100, produced), limit=30)
+        assert await stream.read(1) == b"x"
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert len(produced) <= 4
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_source_errors_propagate(self):
+        async def failing():
+            yield b"abc"
+            raise RuntimeError("boom")
+
+        stream = AsyncStreamIterable(failing())
+        assert await stream.readexactly(3) == b"abc"
+        with pytest.raises(RuntimeError, match="boom"):
+            await stream.read()